@@ -1,8 +1,14 @@
 import frappe
 from frappe.model.document import Document
 
+from ai_tools_dir.utils.search import build_search_keywords
+
 
 class Tool(Document):
+	def validate(self):
+		category_slug = frappe.db.get_value("Category", self.category, "slug") if self.category else None
+		self.search_keywords = build_search_keywords(self.category, category_slug, self.tags)
+
 	@frappe.whitelist()
 	def approve(self):
 		self.ingestion_status = "Approved"
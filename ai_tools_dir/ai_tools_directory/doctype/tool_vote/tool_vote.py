@@ -3,4 +3,4 @@ from frappe.model.document import Document
 
 
 class ToolVote(Document):
-    pass
+	pass
@@ -0,0 +1,160 @@
+"""Read-only guest JSON API for the directory: tool listing, tool detail, categories.
+
+Responses carry weak ETags built from the page-cache generations (utils.page_cache),
+which every Tool, Category, review and vote change bumps, so a poll with a matching
+If-None-Match is answered 304 from Redis without touching the database. Full bodies
+are cached under their ETag.
+"""
+
+import hashlib
+
+import frappe
+import redis
+from frappe.utils import cint
+from werkzeug.wrappers import Response
+
+from ai_tools_dir.utils.http import etag_matches, json_response, not_modified
+from ai_tools_dir.utils.listing import DEFAULT_SORT, SORTS, fetch_page, normalize_sort
+from ai_tools_dir.utils.page_cache import generation, tool_name
+
+# Everything a client may project; internal fields (ingestion, dedupe, logo fetching,
+# search keywords) stay out. So do click_count and ranking_score: every click rewrites
+# them, and bumping the ETag generations per click would defeat the caches.
+PUBLIC_FIELDS = (
+	"slug",
+	"tool_name",
+	"description",
+	"website",
+	"pricing",
+	"category",
+	"tags",
+	"logo",
+	"average_rating",
+	"review_count",
+	"rating_1",
+	"rating_2",
+	"rating_3",
+	"rating_4",
+	"rating_5",
+	"upvote_count",
+	"trending_score",
+	"modified",
+)
+LIST_FIELDS = ("slug", "tool_name", "pricing", "category", "logo", "average_rating", "upvote_count")
+API_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+BODY_TTL = 3600
+BODY_KEY = "ai_tools_dir:api:body:{etag}"
+
+
+def _fields(fields, default) -> list[str]:
+	"""Requested fields (comma-separated or JSON list) limited to PUBLIC_FIELDS; slug always included."""
+	if isinstance(fields, str):
+		fields = frappe.parse_json(fields) if fields.lstrip().startswith("[") else fields.split(",")
+	wanted = [f.strip() for f in fields or [] if isinstance(f, str) and f.strip() in PUBLIC_FIELDS]
+	return list(dict.fromkeys(["slug", *(wanted or default)]))
+
+
+def _etag(version: str, *params) -> str:
+	digest = hashlib.sha1(repr(params).encode()).hexdigest()[:16]
+	return f"{version}-{digest}"
+
+
+def _respond(etag: str, build) -> Response:
+	"""304 if the client has `etag`, the cached body if we have it, else build it."""
+	headers = {"ETag": f'W/"{etag}"'}
+	if etag_matches(etag):
+		return not_modified(etag)
+	cache = frappe.cache()
+	key = cache.make_key(BODY_KEY.format(etag=etag))
+	body = redis.Redis.get(cache, key)
+	if body is not None:
+		response = Response(body, mimetype="application/json")
+		response.headers["Cache-Control"] = "no-cache"
+		response.headers.update(headers)
+		return response
+
+	response = json_response(build(), headers=headers)
+	try:
+		redis.Redis.set(cache, key, response.get_data(), ex=BODY_TTL)
+	except redis.exceptions.RedisError:
+		pass
+	return response
+
+
+@frappe.whitelist(allow_guest=True, methods=["GET"])
+def tools(
+	fields=None,
+	sort: str | None = None,
+	category: str | None = None,
+	cursor: str | None = None,
+	limit: int = API_PAGE_SIZE,
+):
+	"""Approved tools, one keyset page at a time; follow `next_cursor` for the next page.
+
+	`fields` projects the returned columns, `sort` is one of utils.listing.SORTS and
+	`category` is a category slug.
+	"""
+	fields = _fields(fields, LIST_FIELDS)
+	sort = normalize_sort(sort or DEFAULT_SORT)
+	limit = min(max(cint(limit) or API_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+	etag = _etag(f"l{generation('listing')}", fields, sort, category, cursor, limit)
+
+	def build() -> dict:
+		conditions, params = [], {}
+		if category:
+			category_name = frappe.db.get_value("Category", {"slug": category}, "name")
+			if not category_name:
+				frappe.throw("Category not found", frappe.DoesNotExistError)
+			conditions.append("category = %(category)s")
+			params["category"] = category_name
+		rows, next_cursor = fetch_page(
+			conditions, params, sort=sort, cursor=cursor, page_size=limit, fields=fields
+		)
+		return {
+			"sort": sort,
+			"next_cursor": next_cursor,
+			"tools": [{f: row[f] for f in fields} for row in rows],
+		}
+
+	return _respond(etag, build)
+
+
+@frappe.whitelist(allow_guest=True, methods=["GET"])
+def tool(slug: str | None = None, fields=None):
+	"""One approved tool by slug; all public fields unless `fields` narrows them."""
+	slug = slug or frappe.form_dict.get("slug")
+	# slug -> name comes from Redis, so a matching ETag never reaches the database
+	name = tool_name(slug)
+	if not name:
+		frappe.throw("Tool not found", frappe.DoesNotExistError)
+	fields = _fields(fields, PUBLIC_FIELDS)
+	# the tool generation is bumped by edits, reviews, votes and trending drains
+	etag = _etag(f"t{generation(f'tool:{name}')}", name, fields)
+
+	def build() -> dict:
+		row = frappe.db.get_value(
+			"Tool", {"name": name, "ingestion_status": "Approved"}, fields, as_dict=True
+		)
+		if not row:
+			frappe.throw("Tool not found", frappe.DoesNotExistError)
+		return row
+
+	return _respond(etag, build)
+
+
+@frappe.whitelist(allow_guest=True, methods=["GET"])
+def categories():
+	"""Every category with its approved tool count."""
+	etag = _etag(f"c{generation('listing')}")
+
+	def build() -> dict:
+		return {
+			"categories": frappe.get_all(
+				"Category",
+				fields=["name", "slug", "description", "approved_tool_count"],
+				order_by="name asc",
+			)
+		}
+
+	return _respond(etag, build)
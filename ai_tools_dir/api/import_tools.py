@@ -16,8 +16,9 @@ def import_from_uploaded(file_url: str) -> dict:
 	# Case 1: Frappe returned a filesystem path
 	if isinstance(blob_or_path, str) and os.path.exists(blob_or_path):
 		from ai_tools_dir.etl.import_tools import import_tools_from_csv
+
 		return import_tools_from_csv(blob_or_path)
-	
+
 	# Case 2: Frappe returned file content as bytes/str
 	if isinstance(blob_or_path, (bytes, bytearray)):
 		data: bytes = bytes(blob_or_path)
@@ -30,6 +31,7 @@ def import_from_uploaded(file_url: str) -> dict:
 		tmp.write(data)
 		tmp_path = tmp.name
 	from ai_tools_dir.etl.import_tools import import_tools_from_csv
+
 	try:
 		return import_tools_from_csv(tmp_path)
 	finally:
@@ -37,5 +39,3 @@ def import_from_uploaded(file_url: str) -> dict:
 			os.unlink(tmp_path)
 		except Exception:
 			pass
-
-
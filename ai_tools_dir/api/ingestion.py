@@ -1,4 +1,16 @@
+import uuid
+
 import frappe
+from frappe.utils import now_datetime
+
+from ai_tools_dir.events.tools import tools_changed
+
+INGESTION_STATUSES = ("Draft", "Pending Review", "Approved", "Rejected")
+# Rows updated per statement/commit
+BATCH_SIZE = 500
+# Selections larger than this are handed to a background job
+BACKGROUND_THRESHOLD = 1000
+MODERATOR_ROLES = ("System Manager", "Moderator")
 
 
 def _coerce_names_arg(names):
@@ -18,39 +30,112 @@ def _coerce_names_arg(names):
 	return [names]
 
 
-@frappe.whitelist()
-def bulk_approve(names=None) -> dict:
-	names_list = _coerce_names_arg(names)
-	if not names_list:
-		return {"updated": 0}
+def _status_key(job_id: str) -> str:
+	return f"ingestion:{job_id}:status"
+
+
+def _transition(names: list[str], status: str) -> dict:
+	"""Move `names` to `status` in batches. Each batch is committed on its own, so a
+	failure only affects the rows of that batch."""
+	results = {}
 	updated = 0
-	for name in names_list:
+	for i in range(0, len(names), BATCH_SIZE):
+		batch = names[i : i + BATCH_SIZE]
+		current = dict(
+			frappe.db.sql(
+				"SELECT name, ingestion_status FROM `tabTool` WHERE name IN %s",
+				(tuple(batch),),
+			)
+		)
+		to_update = []
+		for name in batch:
+			if name not in current:
+				results[name] = "not_found"
+			elif current[name] == status:
+				results[name] = "unchanged"
+			else:
+				to_update.append(name)
+		if not to_update:
+			continue
 		try:
-			doc = frappe.get_doc("Tool", name)
-			doc.ingestion_status = "Approved"
-			doc.save(ignore_permissions=True)
-			updated += 1
+			frappe.db.sql(
+				"""
+				UPDATE `tabTool`
+				SET ingestion_status = %s, modified = %s, modified_by = %s
+				WHERE name IN %s AND ingestion_status != %s
+				""",
+				(status, now_datetime(), frappe.session.user, tuple(to_update), status),
+			)
+			tools_changed(to_update)
+			frappe.db.commit()
 		except Exception:
 			frappe.db.rollback()
-	frappe.db.commit()
-	return {"updated": updated}
+			frappe.log_error(title=f"Bulk transition to {status} failed")
+			results.update(dict.fromkeys(to_update, "failed"))
+			continue
+		results.update(dict.fromkeys(to_update, "updated"))
+		updated += len(to_update)
+	return {"updated": updated, "results": results}
+
+
+def _bg_transition(transition_id: str, names: list[str], status: str) -> None:
+	job_id = transition_id
+	frappe.cache().set_value(_status_key(job_id), frappe.as_json({"status": "running", "total": len(names)}))
+	try:
+		out = _transition(names, status)
+		frappe.cache().set_value(
+			_status_key(job_id), frappe.as_json({"status": "completed", **out}), expires_in_sec=86400
+		)
+	except Exception as e:
+		frappe.cache().set_value(
+			_status_key(job_id), frappe.as_json({"status": "failed", "error": str(e)}), expires_in_sec=86400
+		)
+		raise
 
 
 @frappe.whitelist()
-def bulk_reject(names=None) -> dict:
-	names_list = _coerce_names_arg(names)
+def bulk_transition(names=None, status: str | None = None) -> dict:
+	"""Set ingestion_status for many Tools with batched updates.
+
+	Returns per-name results (updated / unchanged / not_found / failed). Selections
+	above BACKGROUND_THRESHOLD run as a background job; poll `transition_status`.
+	"""
+	frappe.has_permission("Tool", "write", throw=True)
+	if status not in INGESTION_STATUSES:
+		frappe.throw(f"Invalid ingestion status: {status}")
+	names_list = list(dict.fromkeys(str(n) for n in _coerce_names_arg(names) if n))
 	if not names_list:
-		return {"updated": 0}
-	updated = 0
-	for name in names_list:
-		try:
-			doc = frappe.get_doc("Tool", name)
-			doc.ingestion_status = "Rejected"
-			doc.save(ignore_permissions=True)
-			updated += 1
-		except Exception:
-			frappe.db.rollback()
-	frappe.db.commit()
-	return {"updated": updated}
+		return {"updated": 0, "results": {}}
+	if len(names_list) > BACKGROUND_THRESHOLD:
+		job_id = f"ingestion_{uuid.uuid4().hex}"
+		frappe.cache().set_value(
+			_status_key(job_id), frappe.as_json({"status": "queued", "total": len(names_list)})
+		)
+		frappe.enqueue(
+			"ai_tools_dir.api.ingestion._bg_transition",
+			queue="long",
+			job_id=job_id,
+			timeout=3600,
+			transition_id=job_id,
+			names=names_list,
+			status=status,
+		)
+		return {"queued": True, "job_id": job_id, "total": len(names_list)}
+	return _transition(names_list, status)
+
+
+@frappe.whitelist()
+def transition_status(job_id: str) -> dict:
+	frappe.only_for(MODERATOR_ROLES)
+	raw = frappe.cache().get_value(_status_key(job_id))
+	return frappe.parse_json(raw) if raw else {"status": "unknown"}
 
 
+@frappe.whitelist()
+def bulk_approve(names=None) -> dict:
+	return bulk_transition(names, "Approved")
+
+
+@frappe.whitelist()
+def bulk_reject(names=None) -> dict:
+	return bulk_transition(names, "Rejected")
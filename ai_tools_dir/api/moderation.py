@@ -0,0 +1,130 @@
+import frappe
+from frappe.utils import cint
+
+from ai_tools_dir.etl.logos import MAX_ATTEMPTS as LOGO_MAX_ATTEMPTS
+from ai_tools_dir.utils.pagination import decode_cursor, encode_cursor
+
+QUEUE_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+PENDING_STATUS = "Pending Review"
+COUNTS_CACHE_KEY = "ai_tools_dir:moderation:pending_counts"
+
+
+def pending_counts() -> dict:
+	"""Pending tool counts overall and grouped by source and category.
+
+	Cached until the importer or a moderation transition calls clear_pending_counts.
+	"""
+	counts = frappe.cache().get_value(COUNTS_CACHE_KEY)
+	if counts is not None:
+		return counts
+	rows = frappe.db.sql(
+		"""
+        SELECT COALESCE(source, '') AS source, COALESCE(category, '') AS category, COUNT(*) AS cnt
+        FROM `tabTool`
+        WHERE ingestion_status = %s
+        GROUP BY source, category
+        """,
+		(PENDING_STATUS,),
+		as_dict=True,
+	)
+	counts = {"total": 0, "by_source": {}, "by_category": {}}
+	for r in rows:
+		counts["total"] += r.cnt
+		counts["by_source"][r.source] = counts["by_source"].get(r.source, 0) + r.cnt
+		counts["by_category"][r.category] = counts["by_category"].get(r.category, 0) + r.cnt
+	frappe.cache().set_value(COUNTS_CACHE_KEY, counts)
+	return counts
+
+
+def clear_pending_counts() -> None:
+	frappe.cache().delete_value(COUNTS_CACHE_KEY)
+
+
+def _signals(row: dict) -> dict:
+	duplicate = None
+	if row.possible_duplicate_of:
+		duplicate = {
+			"name": row.possible_duplicate_of,
+			"tool_name": row.duplicate_tool_name,
+			"ingestion_status": row.duplicate_status,
+			"score": row.duplicate_score,
+		}
+	logo = (row.logo or "").lower()
+	if not logo:
+		logo_state = "missing"
+	elif not logo.startswith(("http://", "https://")):
+		logo_state = "local"
+	elif cint(row.logo_fetch_attempts) >= LOGO_MAX_ATTEMPTS:
+		logo_state = "unreachable"
+	else:
+		logo_state = "pending"
+	return {"duplicate": duplicate, "logo": logo_state}
+
+
+@frappe.whitelist()
+def get_queue(
+	cursor: str | None = None,
+	limit: int = QUEUE_PAGE_SIZE,
+	source: str | None = None,
+	category: str | None = None,
+) -> dict:
+	"""Pending tools oldest first, keyset-paginated on (creation, name).
+
+	Each row carries its duplicate and logo signals, and the response includes the
+	cached per-source/per-category counts, so a moderation screen is one request.
+	"""
+	frappe.has_permission("Tool", "write", throw=True)
+	limit = min(max(cint(limit) or QUEUE_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+	conditions = ["t.ingestion_status = %(status)s"]
+	params = {"status": PENDING_STATUS, "limit": limit + 1}
+	if source:
+		conditions.append("t.source = %(source)s")
+		params["source"] = source
+	if category:
+		conditions.append("t.category = %(category)s")
+		params["category"] = category
+	last = decode_cursor(cursor, 2)
+	if last:
+		conditions.append(
+			"(t.creation > %(after_creation)s OR (t.creation = %(after_creation)s AND t.name > %(after_name)s))"
+		)
+		params.update(after_creation=last[0], after_name=last[1])
+
+	rows = frappe.db.sql(
+		f"""
+        SELECT t.name, t.tool_name, t.slug, t.website, t.description, t.source, t.category,
+            t.pricing, t.logo, t.logo_fetch_attempts, t.creation,
+            t.possible_duplicate_of, t.duplicate_score,
+            d.tool_name AS duplicate_tool_name, d.ingestion_status AS duplicate_status
+        FROM `tabTool` t
+        LEFT JOIN `tabTool` d ON d.name = t.possible_duplicate_of
+        WHERE {" AND ".join(conditions)}
+        ORDER BY t.creation ASC, t.name ASC
+        LIMIT %(limit)s
+        """,
+		params,
+		as_dict=True,
+	)
+	next_cursor = None
+	if len(rows) > limit:
+		rows = rows[:limit]
+		next_cursor = encode_cursor(rows[-1].creation, rows[-1].name)
+	tools = []
+	for r in rows:
+		tools.append(
+			{
+				"name": r.name,
+				"tool_name": r.tool_name,
+				"slug": r.slug,
+				"website": r.website,
+				"description": r.description,
+				"source": r.source,
+				"category": r.category,
+				"pricing": r.pricing,
+				"logo": r.logo,
+				"creation": r.creation,
+				"signals": _signals(r),
+			}
+		)
+	return {"tools": tools, "next_cursor": next_cursor, "counts": pending_counts()}
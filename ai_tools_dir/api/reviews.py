@@ -0,0 +1,71 @@
+import frappe
+from frappe.utils import cint
+
+from ai_tools_dir.utils import profiler
+from ai_tools_dir.utils.pagination import decode_cursor, encode_cursor
+
+REVIEWS_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 50
+FIRST_PAGE_TTL = 3600
+
+
+def _first_page_key(tool_name: str) -> str:
+	return f"ai_tools_dir:reviews:first_page:{tool_name}"
+
+
+def fetch_reviews(tool_name: str, cursor: str | None = None, limit: int = REVIEWS_PAGE_SIZE) -> dict:
+	"""One page of reviews ordered by (modified, name) desc using keyset pagination."""
+	limit = min(max(cint(limit) or REVIEWS_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+	params = {"tool": tool_name, "limit": limit + 1}
+	after = ""
+	last = decode_cursor(cursor, 2)
+	if last:
+		after = "AND (modified < %(modified)s OR (modified = %(modified)s AND name < %(name)s))"
+		params.update(modified=last[0], name=last[1])
+	rows = frappe.db.sql(
+		f"""
+        SELECT name, user, rating, comment, modified
+        FROM `tabReview`
+        WHERE tool = %(tool)s {after}
+        ORDER BY modified DESC, name DESC
+        LIMIT %(limit)s
+        """,
+		params,
+		as_dict=True,
+	)
+	next_cursor = None
+	if len(rows) > limit:
+		rows = rows[:limit]
+		next_cursor = encode_cursor(rows[-1].modified, rows[-1].name)
+	for r in rows:
+		r.pop("modified", None)
+	return {"reviews": rows, "next_cursor": next_cursor}
+
+
+def first_review_page(tool_name: str) -> dict:
+	"""First page of reviews for the tool page, cached until a Review hook invalidates it."""
+	key = _first_page_key(tool_name)
+	page = frappe.cache().get_value(key)
+	profiler.note_cache("reviews_first_page", page is not None)
+	if page is None:
+		page = fetch_reviews(tool_name)
+		frappe.cache().set_value(key, page, expires_in_sec=FIRST_PAGE_TTL)
+	return page
+
+
+def clear_review_cache(*tool_names: str) -> None:
+	for tool_name in tool_names:
+		if tool_name:
+			frappe.cache().delete_value(_first_page_key(tool_name))
+
+
+@frappe.whitelist(allow_guest=True, methods=["GET"])
+def get_reviews(slug: str | None = None, cursor: str | None = None, limit: int = REVIEWS_PAGE_SIZE) -> dict:
+	"""Later pages of reviews for an approved tool, following `next_cursor`."""
+	slug = slug or frappe.form_dict.get("slug")
+	tool_name = frappe.db.get_value("Tool", {"slug": slug, "ingestion_status": "Approved"}, "name")
+	if not tool_name:
+		frappe.throw("Tool not found", frappe.DoesNotExistError)
+	if not cursor:
+		return first_review_page(tool_name)
+	return fetch_reviews(tool_name, cursor, limit)
@@ -17,7 +17,7 @@ def test_bg_job() -> dict:
 	"""Test if background jobs are working."""
 	log_id = f"test_{uuid.uuid4().hex}"
 	_set_status(log_id, "queued")
-	
+
 	frappe.enqueue(_test_job, log_id=log_id, job_id=f"test-{log_id}", timeout=30)
 	return {"log_id": log_id, "message": "Test job queued"}
 
@@ -81,7 +81,10 @@ def _bg_run(log_id: str, per_source=None, rate_limit=None, scraper_timeout=None)
 	_set_status(log_id, "running", {"output_csv": output_csv})
 	_write_line(log_file, f"[info] Starting scraper: {script_path}")
 	_write_line(log_file, f"[info] Config: {config_path}")
-	_write_line(log_file, f"[info] Parameters: per_source={per_source}, rate_limit={rate_limit}, scraper_timeout={scraper_timeout}")
+	_write_line(
+		log_file,
+		f"[info] Parameters: per_source={per_source}, rate_limit={rate_limit}, scraper_timeout={scraper_timeout}",
+	)
 	try:
 		per_source_i = _coerce_int(per_source)
 		rate_limit_f = _coerce_float(rate_limit)
@@ -99,7 +102,9 @@ def _bg_run(log_id: str, per_source=None, rate_limit=None, scraper_timeout=None)
 		_write_line(log_file, f"[info] CWD: {app_root}")
 		_write_line(log_file, f"[info] CMD: {' '.join(args)}")
 		_write_line(log_file, f"[info] Starting subprocess...")
-		proc = subprocess.Popen(args, cwd=app_root, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+		proc = subprocess.Popen(
+			args, cwd=app_root, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+		)
 		assert proc.stdout is not None
 		_write_line(log_file, f"[info] Subprocess started (PID: {proc.pid})")
 		for line in proc.stdout:
@@ -112,6 +117,7 @@ def _bg_run(log_id: str, per_source=None, rate_limit=None, scraper_timeout=None)
 			return
 		# Import results
 		from ai_tools_dir.etl.import_tools import import_tools_from_csv
+
 		if not os.path.exists(output_csv):
 			_write_line(log_file, f"[error] Output CSV not found: {output_csv}")
 			_set_status(log_id, "failed", {"error": "no_output"})
@@ -132,7 +138,7 @@ def start(per_source=None, rate_limit=None, timeout=None) -> dict:
 	"""Start scraper in background and return a log_id for streaming logs."""
 	log_id = f"scrape_{uuid.uuid4().hex}"
 	_set_status(log_id, "queued")
-	
+
 	# Try to use long queue first, fallback to default with timeout
 	try:
 		frappe.enqueue(
@@ -157,7 +163,7 @@ def start(per_source=None, rate_limit=None, timeout=None) -> dict:
 			rate_limit=rate_limit,
 			scraper_timeout=timeout,  # Renamed to avoid conflict
 		)
-	
+
 	return {"log_id": log_id}
 
 
@@ -203,7 +209,12 @@ def run(per_source=None, rate_limit=None, timeout=None) -> dict:
 	if proc.returncode != 0:
 		raise frappe.ValidationError(f"Scraper failed (code {proc.returncode}): {stderr or stdout}")
 	from ai_tools_dir.etl.import_tools import import_tools_from_csv
-	stats = import_tools_from_csv(output_csv)
-	return {"scraper_stdout": stdout[-4000:], "scraper_stderr": stderr[-4000:], "import_stats": stats, "output_file": output_csv, "file_size": os.path.getsize(output_csv) if os.path.exists(output_csv) else 0}
-
 
+	stats = import_tools_from_csv(output_csv)
+	return {
+		"scraper_stdout": stdout[-4000:],
+		"scraper_stderr": stderr[-4000:],
+		"import_stats": stats,
+		"output_file": output_csv,
+		"file_size": os.path.getsize(output_csv) if os.path.exists(output_csv) else 0,
+	}
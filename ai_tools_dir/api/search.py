@@ -0,0 +1,16 @@
+import frappe
+from frappe.utils import cint
+
+from ai_tools_dir.utils import autocomplete as autocomplete_index
+from ai_tools_dir.utils.http import json_response
+
+AUTOCOMPLETE_LIMIT = 8
+AUTOCOMPLETE_MAX_AGE = 60
+
+
+@frappe.whitelist(allow_guest=True, methods=["GET"])
+def autocomplete(q: str | None = None, limit: int = AUTOCOMPLETE_LIMIT):
+	"""Typeahead suggestions (approved tools and categories) for a name prefix."""
+	q = (q or frappe.form_dict.get("q") or "").strip()[:64]
+	limit = min(max(cint(limit) or AUTOCOMPLETE_LIMIT, 1), 20)
+	return json_response(autocomplete_index.suggest(q, limit), max_age=AUTOCOMPLETE_MAX_AGE)
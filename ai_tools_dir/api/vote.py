@@ -1,27 +1,77 @@
 import frappe
 
+from ai_tools_dir.utils import trending
+from ai_tools_dir.utils.ranking import refresh_scores
+from ai_tools_dir.utils.votes import record_vote, voted_tools
+
+MAX_VOTE_STATE_SLUGS = 100
+
+
+class InvalidSlugsError(frappe.ValidationError):
+	http_status_code = 400
+
 
 @frappe.whitelist(allow_guest=True)
 def toggle_upvote(slug: str | None = None):
-    slug = slug or frappe.form_dict.get("slug")
-    user = frappe.session.user
-    if user == "Guest":
-        return {"login_required": True}
-    tool_name = frappe.db.get_value("Tool", {"slug": slug}, "name")
-    if not tool_name:
-        frappe.throw("Tool not found", frappe.DoesNotExistError)
-
-    existing = frappe.db.get_value("Tool Vote", {"tool": tool_name, "user": user}, "name")
-    if existing:
-        frappe.delete_doc("Tool Vote", existing, ignore_permissions=True)
-        frappe.db.sql("UPDATE `tabTool` SET upvote_count = GREATEST(COALESCE(upvote_count,0)-1,0) WHERE name=%s", (tool_name,))
-        action = "removed"
-    else:
-        doc = frappe.get_doc({"doctype": "Tool Vote", "tool": tool_name, "user": user})
-        doc.insert(ignore_permissions=True)
-        frappe.db.sql("UPDATE `tabTool` SET upvote_count = COALESCE(upvote_count,0)+1 WHERE name=%s", (tool_name,))
-        action = "added"
-    frappe.db.commit()
-    return {"status": action}
+	slug = slug or frappe.form_dict.get("slug")
+	user = frappe.session.user
+	if user == "Guest":
+		return {"login_required": True}
+	tool_name = frappe.db.get_value("Tool", {"slug": slug}, "name")
+	if not tool_name:
+		frappe.throw("Tool not found", frappe.DoesNotExistError)
+
+	existing = frappe.db.get_value("Tool Vote", {"tool": tool_name, "user": user}, "name")
+	# the Tool Vote hooks leave the user's vote set alone; it is updated after commit
+	frappe.flags.in_vote_toggle = True
+	try:
+		if existing:
+			frappe.delete_doc("Tool Vote", existing, ignore_permissions=True)
+			frappe.db.sql(
+				"UPDATE `tabTool` SET upvote_count = GREATEST(COALESCE(upvote_count,0)-1,0) WHERE name=%s",
+				(tool_name,),
+			)
+			action = "removed"
+		else:
+			doc = frappe.get_doc({"doctype": "Tool Vote", "tool": tool_name, "user": user})
+			doc.insert(ignore_permissions=True)
+			frappe.db.sql(
+				"UPDATE `tabTool` SET upvote_count = COALESCE(upvote_count,0)+1 WHERE name=%s", (tool_name,)
+			)
+			action = "added"
+	finally:
+		frappe.flags.in_vote_toggle = False
+	refresh_scores([tool_name])
+	frappe.db.commit()
+	record_vote(user, tool_name, action == "added")
+	if action == "added":
+		# removals are not subtracted: the decay retires the vote soon enough
+		trending.record(tool_name, trending.VOTE_WEIGHT)
+	return {"status": action}
 
 
+@frappe.whitelist(allow_guest=True, methods=["GET", "POST"])
+def get_vote_state(slugs=None) -> dict:
+	"""{slug: voted} for the session user, for hydrating vote buttons client-side."""
+	slugs = slugs if slugs is not None else (frappe.form_dict.get("slugs") or [])
+	if isinstance(slugs, str):
+		# JSON list or comma-separated
+		if slugs.lstrip().startswith("["):
+			try:
+				slugs = frappe.parse_json(slugs)
+			except ValueError:
+				frappe.throw("slugs must be a JSON list or comma-separated", InvalidSlugsError)
+		else:
+			slugs = slugs.split(",")
+	if not isinstance(slugs, list | tuple):
+		frappe.throw("slugs must be a JSON list or comma-separated", InvalidSlugsError)
+	slugs = [s.strip() for s in slugs if isinstance(s, str) and s.strip()][:MAX_VOTE_STATE_SLUGS]
+	if frappe.session.user == "Guest":
+		return {"login_required": True, "votes": {s: False for s in slugs}}
+	names = (
+		dict(frappe.get_all("Tool", filters={"slug": ["in", slugs]}, fields=["slug", "name"], as_list=True))
+		if slugs
+		else {}
+	)
+	voted = voted_tools(list(names.values()))
+	return {"votes": {s: names.get(s) in voted for s in slugs}}
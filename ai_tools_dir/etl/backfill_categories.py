@@ -1,41 +1,134 @@
 import frappe
+from frappe.utils import cint, now_datetime
+from frappe.website.utils import clear_website_cache
 
+from ai_tools_dir.utils import facets, static_journal
+from ai_tools_dir.utils.counts import clear_counts, refresh_category_counts
+from ai_tools_dir.utils.page_cache import bump_listing
+from ai_tools_dir.utils.search import refresh_search_keywords
 
-def _ensure_category(category_title: str) -> str:
-    title = (category_title or "").strip() or "General"
-    slug = frappe.scrub(title).strip("-")[:140]
-    existing = frappe.db.get_value("Category", {"slug": slug}, "name") or frappe.db.exists("Category", slug)
-    if existing:
-        return existing
-    cat = frappe.get_doc({
-        "doctype": "Category",
-        "name": title,
-        "slug": slug,
-        "description": title,
-    })
-    cat.insert(ignore_permissions=True)
-    return cat.name
+
+def _category_slug(title: str) -> str:
+	return frappe.scrub(title).strip("-")[:140]
+
+
+def _plan() -> tuple[dict, dict]:
+	"""Resolve every distinct Tool.category value against existing Categories.
+
+	Returns (categories to create keyed by slug, stale value -> category name). Work is
+	proportional to the number of distinct values, not the number of tools.
+	"""
+	values = frappe.db.sql("SELECT DISTINCT COALESCE(category, '') FROM `tabTool`", pluck=True)
+	by_name, by_slug = set(), {}
+	for c in frappe.get_all("Category", fields=["name", "slug"]):
+		by_name.add(c.name)
+		if c.slug:
+			by_slug.setdefault(c.slug, c.name)
+
+	to_create, relink = {}, {}
+	for value in values:
+		title = (value or "").strip() or "General"
+		# Category might already be a proper link (existing name). If not, create or map by slug.
+		if value and value in by_name:
+			continue
+		if title in by_name:
+			target = title
+		else:
+			slug = _category_slug(title)
+			target = by_slug.get(slug) or by_slug.get(frappe.scrub(title))
+			if not target:
+				target = to_create.setdefault(slug, title)
+		# Values equal under the case-insensitive, PAD SPACE collation ("writing ",
+		# "Writing") already resolve to the category and would still match `stale`
+		# after the rewrite, so they are left alone.
+		if _collate(target) != _collate(value):
+			relink[value or ""] = target
+	return to_create, relink
+
+
+def _collate(value: str | None) -> str:
+	return (value or "").rstrip(" ").lower()
+
+
+def _create_categories(to_create: dict) -> None:
+	if not to_create:
+		return
+	now = now_datetime()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		"Category",
+		fields=["name", "slug", "description", "owner", "modified_by", "creation", "modified"],
+		values=[(title, slug, title, user, user, now, now) for slug, title in to_create.items()],
+		ignore_duplicates=True,
+	)
 
 
 @frappe.whitelist()
-def run() -> dict:
-    """Backfill categories by ensuring Category docs exist and relinking Tools."""
-    updated = 0
-    tools = frappe.get_all("Tool", fields=["name", "category"])
-    for t in tools:
-        category_value = t.get("category")
-        if not category_value:
-            category_value = "General"
-        # Category might already be a proper link (existing name). If not, create or map by slug.
-        catname = (
-            frappe.db.get_value("Category", category_value, "name")
-            or frappe.db.get_value("Category", {"slug": frappe.scrub(category_value)}, "name")
-            or _ensure_category(category_value)
-        )
-        if catname and catname != category_value:
-            frappe.db.set_value("Tool", t["name"], "category", catname)
-            updated += 1
-    frappe.db.commit()
-    return {"updated": updated}
+def run(batch_size: int = 1000, dry_run: bool = False) -> dict:
+	"""Backfill categories by ensuring Category docs exist and relinking Tools.
+
+	Missing categories are created in one bulk insert; tools are then relinked with
+	one CASE update per batch of `batch_size` rows, committing between batches so
+	row locks stay short.
+	"""
+	batch_size = max(int(batch_size or 1000), 1)
+	to_create, relink = _plan()
+	stale = tuple(relink)
+	if cint(dry_run):
+		would_update = (
+			frappe.db.sql(
+				"SELECT COUNT(*) FROM `tabTool` WHERE COALESCE(category, '') IN %(stale)s",
+				{"stale": stale},
+			)[0][0]
+			if stale
+			else 0
+		)
+		return {"created": len(to_create), "updated": int(would_update), "dry_run": True}
+
+	_create_categories(to_create)
+	frappe.db.commit()
+	if not relink:
+		return {"created": len(to_create), "updated": 0, "dry_run": False}
+
+	case_sql = " ".join(["WHEN %s THEN %s"] * len(relink))
+	case_args = [v for pair in relink.items() for v in pair]
+	updated, last = 0, ""
+	while True:
+		# keyset on name: every pass moves forward even if a row keeps matching `stale`
+		names = frappe.db.sql(
+			"""
+            SELECT name FROM `tabTool`
+            WHERE COALESCE(category, '') IN %(stale)s AND name > %(last)s
+            ORDER BY name
+            LIMIT %(limit)s
+            """,
+			{"stale": stale, "last": last, "limit": batch_size},
+			pluck=True,
+		)
+		if not names:
+			break
+		frappe.db.sql(
+			f"""
+            UPDATE `tabTool`
+            SET category = CASE COALESCE(category, '') {case_sql} END, modified = %s
+            WHERE name IN %s
+            """,
+			(*case_args, now_datetime(), tuple(names)),
+		)
+		refresh_search_keywords(names)
+		frappe.db.commit()
+		updated += len(names)
+		last = names[-1]
+	_categories_relinked(set(relink.values()))
+	return {"created": len(to_create), "updated": updated, "dry_run": False}
 
 
+def _categories_relinked(categories: set[str]) -> None:
+	"""Derived data that depends on Tool.category, refreshed once for the whole backfill."""
+	refresh_category_counts()
+	frappe.db.commit()
+	clear_counts()
+	facets.invalidate()
+	bump_listing()
+	static_journal.record(categories=categories)
+	clear_website_cache()
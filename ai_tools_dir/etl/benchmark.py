@@ -0,0 +1,171 @@
+"""Import benchmark against synthetic seed-schema CSVs.
+
+Run on a throwaway test site (one with `allow_tests` in site_config.json):
+
+	bench --site test_site execute ai_tools_dir.etl.benchmark.run --kwargs '{"sizes": [1000, 10000]}'
+"""
+
+import csv
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import frappe
+from frappe.utils import cint, now_datetime
+
+import ai_tools_dir
+from ai_tools_dir.etl.import_tools import import_tools_from_csv
+from ai_tools_dir.utils.dedupe import remove_tools
+from ai_tools_dir.utils.reports import report_path
+from ai_tools_dir.utils.sql_trace import traced_sql
+
+SEED_HEADER = ["domain", "name", "description", "website", "category", "pricing", "logo", "source"]
+BENCH_SOURCE = "benchmark"
+BENCH_CATEGORY_PREFIX = "Bench Category"
+BASE_CATEGORIES = ["Writing", "Image", "Video", "Audio", "Coding", "Productivity", ""]
+PRICING = ["Free", "Freemium", "Paid", "free", "", "unknown"]
+
+
+def generate_csv(
+	path: str,
+	rows: int,
+	duplicate_ratio: float = 0.1,
+	new_category_ratio: float = 0.02,
+	bad_ratio: float = 0.01,
+	seed: int = 42,
+) -> str:
+	"""Write `rows` synthetic tools in the ai_tools_seed.csv schema to `path`.
+
+	A share of rows repeat an earlier domain, introduce a new category, or lack a
+	domain and website entirely (which the importer skips).
+	"""
+	rng = random.Random(seed)
+	domains: list[str] = []
+	with open(path, "w", newline="", encoding="utf-8") as f:
+		writer = csv.writer(f)
+		writer.writerow(SEED_HEADER)
+		for i in range(rows):
+			roll = rng.random()
+			if roll < bad_ratio:
+				writer.writerow(["", f"Broken {i}", "", "", "", "", "", BENCH_SOURCE])
+				continue
+			if domains and roll < bad_ratio + duplicate_ratio:
+				domain = rng.choice(domains)
+			else:
+				domain = f"bench-{i}.example.ai"
+				domains.append(domain)
+			if rng.random() < new_category_ratio:
+				category = f"{BENCH_CATEGORY_PREFIX} {i}"
+			else:
+				category = rng.choice(BASE_CATEGORIES)
+			writer.writerow(
+				[
+					domain,
+					f"Bench Tool {i}",
+					f"Synthetic tool {i} for import benchmarking. " * rng.randint(1, 4),
+					f"https://{domain}/",
+					category,
+					rng.choice(PRICING),
+					f"https://{domain}/favicon.ico" if rng.random() < 0.7 else "",
+					BENCH_SOURCE,
+				]
+			)
+	return path
+
+
+def _cleanup():
+	# the import indexed every bench tool for near-duplicate detection
+	remove_tools(frappe.get_all("Tool", filters={"source": BENCH_SOURCE}, pluck="name"))
+	frappe.db.delete("Tool", {"source": BENCH_SOURCE})
+	frappe.db.delete("Category", {"name": ["like", f"{BENCH_CATEGORY_PREFIX}%"]})
+	frappe.db.commit()
+
+
+def _measure(csv_path: str, rows: int) -> dict:
+	stats = {"queries": 0}
+	commits: list[float] = []
+
+	def count(*args):
+		stats["queries"] += 1
+
+	tracemalloc.start()
+	start = time.perf_counter()
+	with traced_sql(on_sql=count, on_commit=commits.append):
+		# the synthetic example.ai sites have no logos to fetch
+		result = import_tools_from_csv(csv_path, fetch_logos=False)
+	elapsed = time.perf_counter() - start
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return {
+		"result": result,
+		"seconds": round(elapsed, 3),
+		"rows_per_sec": round(rows / elapsed, 1) if elapsed else None,
+		"queries": stats["queries"],
+		"queries_per_row": round(stats["queries"] / rows, 2) if rows else None,
+		"peak_memory_mb": round(peak / (1024 * 1024), 2),
+		"commits": len(commits),
+		"commit_ms_max": round(max(commits), 2) if commits else None,
+		"commit_ms_total": round(sum(commits), 2),
+	}
+
+
+@frappe.whitelist()
+def run(
+	sizes=None,
+	duplicate_ratio: float = 0.1,
+	new_category_ratio: float = 0.02,
+	bad_ratio: float = 0.01,
+	output: str | None = None,
+	force: bool = False,
+) -> dict:
+	"""Benchmark import_tools_from_csv at each size and write the results as JSON to
+	<site>/private/benchmarks/<output>.
+
+	Each size is imported twice: once into an empty catalogue and once more as a
+	re-scrape of the same file, which exercises the unchanged-row path.
+	"""
+	frappe.only_for("System Manager")
+	if not (frappe.conf.allow_tests or cint(force)):
+		frappe.throw("Run the import benchmark on a test site (allow_tests) or pass force=1")
+	sizes = frappe.parse_json(sizes) if isinstance(sizes, str) else sizes
+	sizes = [int(s) for s in (sizes or [1000, 10000, 100000])]
+	output = report_path(output, "import")
+
+	report = {
+		"app_version": ai_tools_dir.__version__,
+		"site": frappe.local.site,
+		"started_at": str(now_datetime()),
+		"mix": {
+			"duplicate_ratio": float(duplicate_ratio),
+			"new_category_ratio": float(new_category_ratio),
+			"bad_ratio": float(bad_ratio),
+		},
+		"runs": [],
+	}
+	with tempfile.TemporaryDirectory() as tmp:
+		for size in sizes:
+			csv_path = generate_csv(
+				os.path.join(tmp, f"bench_{size}.csv"),
+				size,
+				duplicate_ratio=float(duplicate_ratio),
+				new_category_ratio=float(new_category_ratio),
+				bad_ratio=float(bad_ratio),
+			)
+			_cleanup()
+			try:
+				report["runs"].append(
+					{
+						"rows": size,
+						"initial": _measure(csv_path, size),
+						"reimport": _measure(csv_path, size),
+					}
+				)
+			finally:
+				_cleanup()
+
+	with open(output, "w", encoding="utf-8") as f:
+		f.write(frappe.as_json(report))
+	report["output"] = output
+	return report
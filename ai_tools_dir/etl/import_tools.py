@@ -3,92 +3,173 @@ import os
 import frappe
 from frappe.utils import cstr
 
+from ai_tools_dir.events.tools import tools_changed
+from ai_tools_dir.etl.logos import enqueue_logo_processing
+from ai_tools_dir.etl.schema import compile_header, map_pricing, slugify_domain, slugify_name
+from ai_tools_dir.utils.dedupe import index_tools
+from ai_tools_dir.utils.search import refresh_search_keywords
 
-def slugify(domain: str) -> str:
-	# Use domain as slug (without scheme), keep dots/dashes
-	return cstr(domain).strip().lower()
+# Kept for callers that import the helpers from here
+slugify = slugify_domain
 
+SLUG_STRATEGIES = {
+	# Prefer domain -> slug column -> fallback to website host
+	"domain": lambda r: slugify_domain(r["domain"] or r["slug"] or r["website"]),
+	"name": lambda r: slugify_name(r["tool_name"]),
+}
 
-def map_pricing(val: str) -> str:
-	val = (val or "").strip().title()
-	if val in {"Free", "Freemium", "Paid"}:
-		return val
-	return ""
 
-
-def ensure_category(category_title: str) -> str:
-	"""Ensure Category exists and return its name. Defaults to 'General' when empty."""
-	title = (category_title or "").strip() or "General"
+def ensure_category(category_title: str, default: str = "General") -> str:
+	"""Ensure Category exists and return its name. Defaults to `default` when empty."""
+	title = (category_title or "").strip() or default
 	slug = slugify(title)
 	existing = frappe.db.get_value("Category", {"slug": slug}, "name") or frappe.db.exists("Category", slug)
 	if existing:
 		return existing
-	cat = frappe.get_doc({
-		"doctype": "Category",
-		"name": title,
-		"slug": slug,
-		"description": title,
-	})
+	cat = frappe.get_doc(
+		{
+			"doctype": "Category",
+			"name": title,
+			"slug": slug,
+			"description": title,
+		}
+	)
 	cat.insert(ignore_permissions=True)
 	return cat.name
 
 
-def import_tools_from_csv(csv_path: str) -> dict:
+# Fields the importer owns on Tool; anything else (status, counters) is left alone on updates.
+IMPORTED_FIELDS = ("tool_name", "description", "website", "category", "pricing", "logo", "source")
+ROW_SAVEPOINT = "tool_import_row"
+
+
+def _fetch_existing(slugs: list[str], chunk_size: int = 1000) -> dict:
+	"""Load the current imported fields for all known slugs in a few IN queries."""
+	existing = {}
+	for i in range(0, len(slugs), chunk_size):
+		rows = frappe.get_all(
+			"Tool",
+			filters={"slug": ["in", slugs[i : i + chunk_size]]},
+			fields=["name", "slug", "logo_source_url", *IMPORTED_FIELDS],
+		)
+		for r in rows:
+			existing[r.slug] = r
+	return existing
+
+
+def _diff(current: dict, incoming: dict) -> dict:
+	"""Return only the incoming fields whose value differs from what is stored."""
+	return {k: v for k, v in incoming.items() if cstr(current.get(k)) != cstr(v)}
+
+
+def _read_rows(csv_path: str, slug_by: str) -> list[tuple[str, dict]]:
+	"""Decode the file once into (slug, fields) pairs using the compiled header mapping."""
+	slug_for = SLUG_STRATEGIES[slug_by]
+	with open(csv_path, newline="", encoding="utf-8") as f:
+		reader = csv.reader(f)
+		header = next(reader, None)
+		if not header:
+			return []
+		decode = compile_header(header)
+		out = []
+		for values in reader:
+			row = decode(values)
+			out.append((slug_for(row), row))
+		return out
+
+
+def import_tools_from_csv(
+	csv_path: str, slug_by: str = "domain", default_category: str = "General", fetch_logos: bool = True
+) -> dict:
+	"""Upsert Tools from a CSV export.
+
+	`slug_by` picks how rows are keyed: "domain" (seed/scraper files) or "name".
+	`fetch_logos=False` skips queueing logo localization for the imported rows.
+	"""
 	if not os.path.exists(csv_path):
 		raise FileNotFoundError(csv_path)
-	created, updated, skipped = 0, 0, 0
-	with open(csv_path, newline="", encoding="utf-8") as f:
-		reader = csv.DictReader(f)
-
-		def get_first(row: dict, keys: list[str]) -> str:
-			for k in keys:
-				if k in row and row[k] is not None and str(row[k]).strip() != "":
-					return str(row[k])
-			return ""
-
-		for row in reader:
-			try:
-				# Accept both seed schema and Frappe export schema
-				domain = get_first(row, ["domain", "Domain"]) or ""
-				slug_field = get_first(row, ["slug", "Slug"]) or ""
-				website_field = get_first(row, ["website", "Website"]) or ""
-				# Prefer domain -> slug column -> fallback to website host
-				base_for_slug = domain or slug_field or website_field
-				slug = slugify(base_for_slug)
-				if not slug:
-					skipped += 1
-					continue
-				name = (get_first(row, ["name", "Tool Name"]) or slug.split(".")[0]).strip()[:140]
-				docname = frappe.db.exists("Tool", {"slug": slug})
-				if docname:
-					doc = frappe.get_doc("Tool", docname)
-					updated += 1
-				else:
-					doc = frappe.new_doc("Tool")
-					doc.slug = slug
-					created += 1
-				doc.tool_name = name
-				doc.description = get_first(row, ["description", "Description"]).strip()
-				doc.website = website_field.strip()
-				category_title = get_first(row, ["category", "Category"]).strip()
-				catname = ensure_category(category_title)
-				if catname:
-					doc.category = catname
-				doc.pricing = map_pricing(get_first(row, ["pricing", "Pricing"]))
+	created, updated, unchanged, skipped = 0, 0, 0, 0
+	rows = _read_rows(csv_path, slug_by)
+	existing = _fetch_existing(sorted({slug for slug, _ in rows if slug}))
+	categories: dict[str, str] = {}
+	changed_names: list[str] = []
+	# categories that tools moved out of, for the per-category counts
+	left_categories: set[str] = set()
+
+	for slug, row in rows:
+		if not slug or (slug_by == "name" and not row["website"]):
+			skipped += 1
+			continue
+		category_title = row["category"]
+		# a failing row is rolled back to here, leaving earlier rows (and `existing`,
+		# `categories` and the counters that describe them) intact
+		frappe.db.savepoint(ROW_SAVEPOINT)
+		try:
+			if category_title not in categories:
+				categories[category_title] = ensure_category(category_title, default_category)
+			incoming = {
+				"tool_name": row["tool_name"] or slug.split(".")[0],
+				"description": row["description"],
+				"website": row["website"],
+				"pricing": row["pricing"],
 				# For logo, if Attach Image expects file, store URL in doc.logo as-is; app can fetch later
-				doc.logo = get_first(row, ["logo", "Logo"]).strip()
+				"logo": row["logo"],
 				# Ingestion tracking
-				doc.source = (get_first(row, ["source", "Source"]) or "scraper").strip()
-				if not getattr(doc, "ingestion_status", None):
-					# default new records to Pending Review; preserve existing status on updates
-					doc.ingestion_status = "Pending Review"
-				doc.save(ignore_permissions=True)
-			except Exception:
-				frappe.db.rollback()
-				skipped += 1
-				continue
+				"source": row["source"] or "scraper",
+			}
+			if categories[category_title]:
+				incoming["category"] = categories[category_title]
+
+			current = existing.get(slug)
+			if current:
+				if current.logo_source_url and incoming["logo"] == current.logo_source_url:
+					# logo was already localized from this URL by etl.logos
+					del incoming["logo"]
+				changed = _diff(current, incoming)
+				if not changed:
+					unchanged += 1
+					continue
+				if "logo" in changed:
+					changed["logo_fetch_attempts"] = 0
+				if "category" in changed and current.category:
+					left_categories.add(current.category)
+				# Write only the changed columns; status is preserved on updates. This skips
+				# Tool.validate and doc_events: search_keywords and the derived data are
+				# refreshed for the whole batch below.
+				frappe.db.set_value("Tool", current.name, changed)
+				current.update(changed)
+				changed_names.append(current.name)
+				updated += 1
+			else:
+				doc = frappe.new_doc("Tool")
+				doc.slug = slug
+				doc.update(incoming)
+				# default new records to Pending Review
+				doc.ingestion_status = "Pending Review"
+				doc.flags.defer_tool_events = True
+				doc.insert(ignore_permissions=True)
+				changed_names.append(doc.name)
+				existing[slug] = frappe._dict(name=doc.name, slug=slug, **incoming)
+				created += 1
+		except Exception:
+			frappe.db.rollback(save_point=ROW_SAVEPOINT)
+			# a category created by this row was rolled back with it
+			if categories.get(category_title) and not frappe.db.exists(
+				"Category", categories[category_title]
+			):
+				del categories[category_title]
+			skipped += 1
+			continue
+	refresh_search_keywords(changed_names)
+	tools_changed(changed_names, list(left_categories))
+	try:
+		index_tools(changed_names)
+	except Exception:
+		frappe.log_error(title="Near-duplicate indexing failed during import")
 	frappe.db.commit()
-	return {"created": created, "updated": updated, "skipped": skipped}
+	if fetch_logos and (created or updated):
+		enqueue_logo_processing()
+	return {"created": created, "updated": updated, "unchanged": unchanged, "skipped": skipped}
 
 
 @frappe.whitelist()
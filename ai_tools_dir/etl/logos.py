@@ -0,0 +1,153 @@
+"""Localize remote Tool logos as small, uniform thumbnails.
+
+The importer stores whatever favicon URL the scraper found in `Tool.logo`. This job
+downloads those concurrently, normalizes them to fixed-size WEBP thumbnails stored as
+public Files (one File per distinct image) and points `Tool.logo` at the local copy.
+Only tools whose logo is still a remote URL are picked up, so runs are incremental.
+"""
+
+import hashlib
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import frappe
+import requests
+
+from ai_tools_dir.utils.page_cache import bump_tools
+
+THUMBNAIL_SIZE = 64
+MAX_ATTEMPTS = 3
+MAX_BYTES = 2 * 1024 * 1024
+FETCH_WORKERS = 8
+FETCH_TIMEOUT = 10
+USER_AGENT = "Mozilla/5.0 (compatible; AIToolsDirectory/1.0; +logo-fetcher)"
+
+
+def _download(url: str, retries: int = 1) -> bytes:
+	last_e: Exception | None = None
+	for i in range(retries + 1):
+		try:
+			resp = requests.get(url, timeout=FETCH_TIMEOUT, headers={"User-Agent": USER_AGENT}, stream=True)
+			resp.raise_for_status()
+			data = resp.raw.read(MAX_BYTES + 1, decode_content=True)
+			if len(data) > MAX_BYTES:
+				raise ValueError("logo too large")
+			if not data:
+				raise ValueError("empty response")
+			return data
+		except Exception as e:
+			last_e = e
+			time.sleep(0.5 * (i + 1))
+	raise last_e  # type: ignore[misc]
+
+
+def make_thumbnail(data: bytes, size: int = THUMBNAIL_SIZE) -> bytes:
+	"""Fit the image into a transparent size x size square and encode it as WEBP."""
+	from PIL import Image
+
+	with Image.open(io.BytesIO(data)) as img:
+		if img.format == "ICO" and img.info.get("sizes"):
+			# .ico files carry several sizes; pick the largest one
+			img.size = max(img.info["sizes"])
+		img = img.convert("RGBA")
+		img.thumbnail((size, size), Image.LANCZOS)
+		canvas = Image.new("RGBA", (size, size), (255, 255, 255, 0))
+		canvas.paste(img, ((size - img.width) // 2, (size - img.height) // 2), img)
+		out = io.BytesIO()
+		canvas.save(out, format="WEBP", quality=80, method=6)
+		return out.getvalue()
+
+
+def _fetch_thumbnail(url: str) -> tuple[str, bytes | None, str | None]:
+	# Runs in a worker thread: network and image work only, no frappe.db access
+	try:
+		return url, make_thumbnail(_download(url)), None
+	except Exception as e:
+		return url, None, str(e)[:140]
+
+
+def _store_thumbnail(thumb: bytes) -> str:
+	"""Save the thumbnail as a public File, reusing an existing one with the same content."""
+	digest = hashlib.sha1(thumb).hexdigest()[:20]
+	file_name = f"logo-{digest}.webp"
+	existing = frappe.db.get_value("File", {"file_name": file_name, "is_private": 0}, "file_url")
+	if existing:
+		return existing
+	file_doc = frappe.get_doc(
+		{
+			"doctype": "File",
+			"file_name": file_name,
+			"content": thumb,
+			"is_private": 0,
+		}
+	)
+	file_doc.save(ignore_permissions=True)
+	return file_doc.file_url
+
+
+def _pending(limit: int) -> list[dict]:
+	return frappe.db.sql(
+		"""
+		SELECT name, logo
+		FROM `tabTool`
+		WHERE (logo LIKE 'http://%%' OR logo LIKE 'https://%%')
+			AND COALESCE(logo_fetch_attempts, 0) < %(max_attempts)s
+		ORDER BY modified
+		LIMIT %(limit)s
+		""",
+		{"max_attempts": MAX_ATTEMPTS, "limit": limit},
+		as_dict=True,
+	)
+
+
+def process_pending_logos(limit: int = 500) -> dict:
+	"""Localize up to `limit` remote logos. Failed tools are retried on later runs
+	until they reach MAX_ATTEMPTS."""
+	tools = _pending(int(limit))
+	if not tools:
+		return {"localized": 0, "failed": 0}
+
+	urls = sorted({t.logo for t in tools})
+	with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+		fetched = {url: (thumb, err) for url, thumb, err in pool.map(_fetch_thumbnail, urls)}
+
+	local_urls: dict[str, str] = {}
+	localized_names: list[str] = []
+	failed = 0
+	for t in tools:
+		thumb, err = fetched[t.logo]
+		try:
+			if thumb is None:
+				raise ValueError(err or "fetch failed")
+			if t.logo not in local_urls:
+				local_urls[t.logo] = _store_thumbnail(thumb)
+			frappe.db.set_value(
+				"Tool",
+				t.name,
+				{"logo": local_urls[t.logo], "logo_source_url": t.logo, "logo_fetch_attempts": 0},
+				update_modified=False,
+			)
+			localized_names.append(t.name)
+		except Exception as e:
+			frappe.db.sql(
+				"UPDATE `tabTool` SET logo_fetch_attempts = COALESCE(logo_fetch_attempts, 0) + 1 WHERE name = %s",
+				(t.name,),
+			)
+			frappe.logger("ai_tools_dir").info(f"logo fetch failed for {t.name} ({t.logo}): {e}")
+			failed += 1
+	# cached and static pages still hot-link the remote logo; applied after the commit
+	bump_tools(localized_names)
+	frappe.db.commit()
+	return {"localized": len(localized_names), "failed": failed}
+
+
+def enqueue_logo_processing() -> None:
+	frappe.enqueue(
+		"ai_tools_dir.etl.logos.process_pending_logos",
+		queue="long",
+		job_id="ai_tools_dir:process_pending_logos",
+		deduplicate=True,
+		enqueue_after_commit=True,
+		timeout=1800,
+	)
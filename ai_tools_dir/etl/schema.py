@@ -0,0 +1,78 @@
+"""Header-to-field mapping shared by every Tool CSV importer.
+
+The mapping is compiled once per file from its header row, so decoding a row is a
+handful of list index lookups instead of scanning alias keys for every field.
+"""
+
+from collections.abc import Callable
+from typing import NamedTuple
+
+import frappe
+from frappe.utils import cstr
+
+
+def slugify_domain(domain: str) -> str:
+	# Use domain as slug (without scheme), keep dots/dashes
+	return cstr(domain).strip().lower()
+
+
+def slugify_name(text: str) -> str:
+	return frappe.scrub(cstr(text)).strip("-")[:140]
+
+
+def map_pricing(val: str) -> str:
+	val = (val or "").strip().title()
+	if val in {"Free", "Freemium", "Paid"}:
+		return val
+	return ""
+
+
+class Column(NamedTuple):
+	field: str
+	headers: tuple[str, ...]
+	transform: Callable[[str], str] = str.strip
+
+
+# Accepts both the seed/scraper schema and the Frappe export schema.
+TOOL_COLUMNS = (
+	Column("domain", ("domain", "Domain")),
+	Column("slug", ("slug", "Slug")),
+	Column("website", ("website", "Website")),
+	Column("tool_name", ("name", "Tool Name"), lambda v: v.strip()[:140]),
+	Column("description", ("description", "Description")),
+	Column("category", ("category", "Category")),
+	Column("pricing", ("pricing", "Pricing"), map_pricing),
+	Column("logo", ("logo", "Logo")),
+	Column("source", ("source", "Source")),
+)
+
+
+def compile_header(
+	header: list[str], columns: tuple[Column, ...] = TOOL_COLUMNS
+) -> Callable[[list[str]], dict]:
+	"""Resolve column indexes for `header` and return a decoder for raw csv rows.
+
+	When several alias headers are present the first non-empty one wins, matching
+	the old per-row alias scan.
+	"""
+	positions: dict[str, int] = {}
+	for i, h in enumerate(header):
+		positions.setdefault(cstr(h).lstrip("\ufeff").strip(), i)
+	plan = []
+	for col in columns:
+		idxs = tuple(positions[h] for h in col.headers if h in positions)
+		plan.append((col.field, idxs, col.transform))
+
+	def decode(values: list[str]) -> dict:
+		out = {}
+		n = len(values)
+		for field, idxs, transform in plan:
+			raw = ""
+			for i in idxs:
+				if i < n and values[i] and values[i].strip():
+					raw = values[i]
+					break
+			out[field] = transform(raw)
+		return out
+
+	return decode
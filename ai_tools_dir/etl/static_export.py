@@ -0,0 +1,321 @@
+"""Static pre-rendering of the anonymous directory pages.
+
+Renders /tools/<slug> for every approved tool, /categories/<slug> for every category
+and the first LISTING_PAGES homepage pages into a static tree that nginx or a CDN
+can serve without Python:
+
+	<output>/builds/<build id>/index.html, page/<n>/index.html,
+	                           tools/<slug>/index.html, categories/<slug>/index.html,
+	                           manifest.json
+	<output>/current -> builds/<build id>
+
+Pages are rendered as Guest, in parallel worker processes. The first run (or
+`full=True`) renders everything; later runs start from a hard-linked copy of the
+current build and re-render only what the change journal (utils.static_journal)
+names. `current` is switched with an atomic rename once the new build and its
+manifest are complete, so readers never see a half-written tree. A page that fails to
+render keeps its previous file and goes back into the journal for the next run.
+
+Pages link with query strings; see the README for the nginx rules that map only
+bare requests (and `/?page=N`) onto this tree.
+
+	bench --site ai-tools.localhost execute ai_tools_dir.etl.static_export.run
+	bench --site ai-tools.localhost execute ai_tools_dir.etl.static_export.run --kwargs '{"full": 1}'
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import frappe
+import redis
+from frappe.utils import now_datetime
+
+from ai_tools_dir.utils import static_journal
+
+LISTING_PAGES = 5
+KEEP_BUILDS = 3
+RENDER_BATCH = 50
+LOCK_KEY = "ai_tools_dir:static_export:lock"
+LOCK_TTL = 3600
+MANIFEST = "manifest.json"
+
+
+def _output_root(output: str | None) -> str:
+	return os.path.abspath(
+		output or frappe.conf.get("ai_tools_static_export_path") or frappe.get_site_path("static_export")
+	)
+
+
+def _tool_page(slug: str) -> tuple[str, dict, str]:
+	return f"/tools/{slug}", {}, f"tools/{slug}/index.html"
+
+
+def _category_page(slug: str) -> tuple[str, dict, str]:
+	return f"/categories/{slug}", {}, f"categories/{slug}/index.html"
+
+
+def _listing_pages() -> list[tuple[str, dict, str]]:
+	pages = [("/", {}, "index.html")]
+	pages += [("/", {"page": n}, f"page/{n}/index.html") for n in range(2, LISTING_PAGES + 1)]
+	return pages
+
+
+# --- worker processes -------------------------------------------------------
+
+
+def _init_worker(site: str, sites_path: str) -> None:
+	frappe.init(site=site, sites_path=sites_path)
+	frappe.connect()
+	frappe.set_user("Guest")
+
+
+def _render_batch(pages: list[tuple[str, dict, str]], build_dir: str) -> list[tuple[str, str | None]]:
+	"""Render `pages` into `build_dir`; returns (file, sha1) with sha1 None for pages
+	that did not render with status 200 (their previous file, if any, is left alone)."""
+	from urllib.parse import urlencode
+
+	from frappe.utils import set_request
+	from frappe.website.serve import get_response
+
+	results = []
+	for path, query, file in pages:
+		target = os.path.join(build_dir, file)
+		try:
+			set_request(method="GET", path=path, query_string=urlencode(query))
+			frappe.local.form_dict = frappe._dict(query)
+			frappe.local.response = frappe._dict()
+			response = get_response(path)
+			if response.status_code != 200:
+				raise frappe.DoesNotExistError(path)
+			html = response.get_data()
+		except Exception:
+			frappe.logger("ai_tools_dir").exception(f"static export: failed to render {path}")
+			results.append((file, None))
+			continue
+		finally:
+			frappe.db.rollback()
+		os.makedirs(os.path.dirname(target), exist_ok=True)
+		tmp = f"{target}.tmp"
+		with open(tmp, "wb") as f:
+			f.write(html)
+		# replace, never write in place: the previous build shares this inode
+		os.replace(tmp, target)
+		results.append((file, hashlib.sha1(html).hexdigest()))
+	return results
+
+
+def _render(pages: list[tuple[str, dict, str]], build_dir: str, workers: int) -> dict[str, str | None]:
+	batches = [pages[i : i + RENDER_BATCH] for i in range(0, len(pages), RENDER_BATCH)]
+	if not batches:
+		return {}
+	results = {}
+	with ProcessPoolExecutor(
+		max_workers=min(workers, len(batches)),
+		mp_context=multiprocessing.get_context("spawn"),
+		initializer=_init_worker,
+		initargs=(frappe.local.site, os.path.abspath(frappe.local.sites_path)),
+	) as pool:
+		for batch in pool.map(_render_batch, batches, [build_dir] * len(batches)):
+			results.update(batch)
+	return results
+
+
+# --- build planning ---------------------------------------------------------
+
+
+def _read_manifest(build_dir: str) -> dict | None:
+	try:
+		with open(os.path.join(build_dir, MANIFEST)) as f:
+			return json.load(f)
+	except (OSError, ValueError):
+		return None
+
+
+def _plan_full() -> tuple[list, dict, dict]:
+	tools = frappe.get_all("Tool", filters={"ingestion_status": "Approved"}, fields=["name", "slug"])
+	categories = frappe.get_all("Category", fields=["name", "slug"])
+	pages = _listing_pages()
+	pages += [_tool_page(t.slug) for t in tools]
+	pages += [_category_page(c.slug) for c in categories]
+	return (
+		pages,
+		{t.name: _tool_page(t.slug)[2] for t in tools},
+		{c.name: _category_page(c.slug)[2] for c in categories},
+	)
+
+
+def _plan_incremental(entries: set[str], manifest: dict) -> tuple[list, dict, dict, list[str]]:
+	"""Pages to re-render and files to delete for the journaled changes."""
+	tool_files = dict(manifest.get("tools") or {})
+	category_files = dict(manifest.get("categories") or {})
+	tool_names = [e.split(":", 1)[1] for e in entries if e.startswith("tool:")]
+	category_names = {e.split(":", 1)[1] for e in entries if e.startswith("category:")}
+	pages, removed = [], []
+
+	tools = {
+		t.name: t
+		for t in frappe.get_all(
+			"Tool",
+			filters={"name": ["in", tool_names or [""]]},
+			fields=["name", "slug", "category", "ingestion_status"],
+		)
+	}
+	for name in tool_names:
+		tool = tools.get(name)
+		old_file = tool_files.pop(name, None)
+		if tool:
+			# approved or not, its category page may list it
+			category_names.add(tool.category)
+			if tool.ingestion_status != "Approved":
+				tool = None
+		if tool:
+			page = _tool_page(tool.slug)
+			pages.append(page)
+			tool_files[name] = page[2]
+		if old_file and (not tool or old_file != tool_files.get(name)):
+			removed.append(old_file)
+
+	existing = {
+		c.name: c
+		for c in frappe.get_all(
+			"Category",
+			filters={"name": ["in", [c for c in category_names if c] or [""]]},
+			fields=["name", "slug"],
+		)
+	}
+	for name in category_names:
+		category = existing.get(name)
+		old_file = category_files.pop(name, None)
+		if category:
+			page = _category_page(category.slug)
+			pages.append(page)
+			category_files[name] = page[2]
+		if old_file and (not category or old_file != category_files.get(name)):
+			removed.append(old_file)
+
+	if static_journal.LISTING in entries:
+		pages += _listing_pages()
+	return pages, tool_files, category_files, removed
+
+
+# --- deploy -----------------------------------------------------------------
+
+
+def _swap_current(root: str, build_dir: str) -> None:
+	link = os.path.join(root, "current")
+	tmp_link = f"{link}.{os.getpid()}.tmp"
+	os.symlink(os.path.relpath(build_dir, root), tmp_link)
+	os.replace(tmp_link, link)
+
+
+def _prune(root: str, keep: str) -> None:
+	builds_dir = os.path.join(root, "builds")
+	builds = sorted(d for d in os.listdir(builds_dir) if d != os.path.basename(keep))
+	for old in builds[: max(len(builds) - (KEEP_BUILDS - 1), 0)]:
+		shutil.rmtree(os.path.join(builds_dir, old), ignore_errors=True)
+
+
+def _journal_failed(failed: set[str], tool_files: dict, category_files: dict) -> None:
+	"""Put the changes behind pages that failed to render back into the journal."""
+	listing_files = {file for _, _, file in _listing_pages()}
+	static_journal.record(
+		tools=[name for name, file in tool_files.items() if file in failed],
+		categories=[name for name, file in category_files.items() if file in failed],
+		listing=bool(failed & listing_files),
+	)
+
+
+def run(full: bool = False, output: str | None = None, workers: int | None = None) -> dict:
+	"""Build the static tree and switch `current` to it. Incremental unless `full` or
+	there is no previous build."""
+	started = time.monotonic()
+	cache = frappe.cache()
+	if not redis.Redis.set(cache, cache.make_key(LOCK_KEY), 1, nx=True, ex=LOCK_TTL):
+		return {"skipped": "another export is running"}
+	root = _output_root(output)
+	workers = workers or os.cpu_count() or 4
+	entries = static_journal.claim()
+	done = False
+	try:
+		current = os.path.realpath(os.path.join(root, "current"))
+		manifest = None if full else _read_manifest(current)
+		if manifest is not None and not entries:
+			done = True
+			return {"mode": "incremental", "rendered": 0, "removed": 0, "build": manifest["build"]}
+
+		build_id = now_datetime().strftime("%Y%m%d%H%M%S%f")
+		build_dir = os.path.join(root, "builds", build_id)
+		os.makedirs(os.path.dirname(build_dir), exist_ok=True)
+		if manifest is None:
+			mode = "full"
+			os.makedirs(build_dir)
+			pages, tool_files, category_files = _plan_full()
+			removed = []
+			files = {}
+		else:
+			mode = "incremental"
+			# hard links: unchanged pages cost no copying and no disk
+			shutil.copytree(current, build_dir, copy_function=os.link)
+			pages, tool_files, category_files, removed = _plan_incremental(entries, manifest)
+			files = dict(manifest["files"])
+		for file in removed:
+			files.pop(file, None)
+			path = os.path.join(build_dir, file)
+			if os.path.exists(path):
+				os.unlink(path)
+
+		# drop duplicates (e.g. two changed tools in one category)
+		pages = list({page[2]: page for page in pages}.values())
+		failed = set()
+		for file, sha1 in _render(pages, build_dir, workers).items():
+			if sha1:
+				files[file] = sha1
+			else:
+				# the previous render, if any, stays in the build and the manifest
+				failed.add(file)
+
+		rendered = {file for _, _, file in pages if file not in failed}
+		manifest = {
+			"build": build_id,
+			"mode": mode,
+			"site": frappe.local.site,
+			"created": str(now_datetime()),
+			"files": files,
+			"tools": {n: f for n, f in tool_files.items() if f in files},
+			"categories": {n: f for n, f in category_files.items() if f in files},
+		}
+		# replace, never write in place: the copied manifest is a hard link into the live build
+		manifest_path = os.path.join(build_dir, MANIFEST)
+		with open(f"{manifest_path}.tmp", "w") as f:
+			json.dump(manifest, f, indent=1, sort_keys=True)
+		os.replace(f"{manifest_path}.tmp", manifest_path)
+		_swap_current(root, build_dir)
+		_prune(root, build_dir)
+		done = True
+	finally:
+		static_journal.release(done)
+		redis.Redis.delete(cache, cache.make_key(LOCK_KEY))
+	if failed:
+		_journal_failed(failed, tool_files, category_files)
+
+	result = {
+		"mode": mode,
+		"rendered": len(rendered),
+		"failed": len(failed),
+		"removed": len(removed),
+		"build": build_id,
+		"seconds": round(time.monotonic() - started, 2),
+	}
+	frappe.logger("ai_tools_dir").info(f"static export: {result}")
+	return result
+
+
+def scheduled_export() -> dict | None:
+	"""Scheduler entry point; only runs on sites that set `ai_tools_static_export`."""
+	if frappe.conf.get("ai_tools_static_export"):
+		return run()
@@ -0,0 +1,20 @@
+from ai_tools_dir.utils import autocomplete, facets, static_journal
+from ai_tools_dir.utils.counts import clear_counts
+from ai_tools_dir.utils.page_cache import bump_listing
+
+
+def on_category_change(doc, method=None, *args):
+	"""Category saves, renames and deletes change listing pages and per-category counts."""
+	bump_listing()
+	clear_counts()
+	# renames rewrite Tool.category without Tool hooks
+	facets.invalidate()
+	# after_rename passes (old, new, merge)
+	names = [doc.name, *args[:2]]
+	static_journal.record(categories=names)
+	if method == "on_trash":
+		# the row is still there during on_trash
+		autocomplete.remove_categories([doc.name])
+	else:
+		# a renamed-away name drops out; the current name is re-indexed
+		autocomplete.update_categories(names)
@@ -1,35 +1,126 @@
+import time
+
 import frappe
+from frappe.utils import cint
+
+from ai_tools_dir.api.reviews import clear_review_cache
+from ai_tools_dir.utils import facets
+from ai_tools_dir.utils.page_cache import bump_tools
+from ai_tools_dir.utils.ranking import refresh_scores
+
+BACKFILL_BATCH_SIZE = 500
+STARS = (1, 2, 3, 4, 5)
+AGGREGATE_FIELDS = ("review_count", "rating_sum", *(f"rating_{s}" for s in STARS), "average_rating")
+
+
+def on_review_insert(doc, method=None):
+	_apply_delta(doc.tool, doc.rating, +1)
+	clear_review_cache(doc.tool)
+
+
+def on_review_update(doc, method=None):
+	"""Move the review's contribution from its previous (tool, rating) to the new one."""
+	before = doc.get_doc_before_save()
+	if before is None:
+		# fresh insert; counted by on_review_insert
+		return
+	clear_review_cache(before.tool, doc.tool)
+	if before.tool == doc.tool and cint(before.rating) == cint(doc.rating):
+		return
+	_apply_delta(before.tool, before.rating, -1)
+	_apply_delta(doc.tool, doc.rating, +1)
 
 
-def update_tool_aggregates(doc, method=None):
-    """Recompute average_rating and review_count for the linked Tool."""
-    tool_name = doc.tool if getattr(doc, "tool", None) else None
-    if not tool_name:
-        return
-    _recompute_for_tool(tool_name)
+def on_review_trash(doc, method=None):
+	_apply_delta(doc.tool, doc.rating, -1)
+	clear_review_cache(doc.tool)
+
+
+def _apply_delta(tool_name: str | None, rating, sign: int) -> None:
+	"""Add (sign=+1) or remove (sign=-1) one review from the Tool's running aggregates.
+
+	A single-row UPDATE; no scan over the tool's reviews. average_rating is derived
+	from the updated sum and histogram in the same statement.
+	"""
+	if not tool_name:
+		return
+	rating = cint(rating)
+	star = rating if rating in STARS else None
+	hist = ", ".join(f"rating_{s} = GREATEST(COALESCE(rating_{s}, 0) + %(d{s})s, 0)" for s in STARS)
+	rated = " + ".join(f"rating_{s}" for s in STARS)
+	frappe.db.sql(
+		f"""
+        UPDATE `tabTool`
+        SET review_count = GREATEST(COALESCE(review_count, 0) + %(count)s, 0),
+            rating_sum = GREATEST(COALESCE(rating_sum, 0) + %(sum)s, 0),
+            {hist},
+            average_rating = COALESCE(ROUND(rating_sum / NULLIF({rated}, 0), 2), 0)
+        WHERE name = %(tool)s
+        """,
+		{
+			"tool": tool_name,
+			"count": sign,
+			"sum": sign * rating if star else 0,
+			**{f"d{s}": sign if s == star else 0 for s in STARS},
+		},
+	)
+	refresh_scores([tool_name])
+	# average_rating may have crossed a minimum-rating facet
+	facets.update_tools([tool_name])
 
 
 def backfill_all_tool_aggregates():
-    """Periodic job to recompute aggregates for all tools."""
-    tool_names = frappe.get_all("Tool", pluck="name")
-    for name in tool_names:
-        _recompute_for_tool(name)
-
-
-def _recompute_for_tool(tool_name: str):
-    res = frappe.db.sql(
-        """
-        SELECT COUNT(*) AS cnt, AVG(COALESCE(rating, 0)) AS avg
-        FROM `tabReview`
-        WHERE tool = %s
+	"""Periodic job that reconciles the running aggregates against tabReview.
+
+	One grouped aggregate over tabReview is joined back to Tool, and only tools whose
+	stored values differ (including tools that lost all their reviews) are written.
+	"""
+	started = time.monotonic()
+	hist_cols = ", ".join(f"SUM(rating = {s}) AS rating_{s}" for s in STARS)
+	drift = " OR ".join(
+		f"COALESCE(t.{f}, 0) != COALESCE(r.{f}, 0)" for f in AGGREGATE_FIELDS if f != "average_rating"
+	)
+	stale = frappe.db.sql(
+		f"""
+        SELECT t.name, {", ".join(f"COALESCE(r.{f}, 0) AS {f}" for f in AGGREGATE_FIELDS)}
+        FROM `tabTool` t
+        LEFT JOIN (
+            SELECT tool,
+                COUNT(*) AS review_count,
+                SUM(CASE WHEN rating BETWEEN 1 AND 5 THEN rating ELSE 0 END) AS rating_sum,
+                {hist_cols},
+                ROUND(AVG(CASE WHEN rating BETWEEN 1 AND 5 THEN rating END), 2) AS average_rating
+            FROM `tabReview`
+            GROUP BY tool
+        ) r ON r.tool = t.name
+        WHERE {drift}
+            OR ROUND(COALESCE(t.average_rating, 0), 2) != COALESCE(r.average_rating, 0)
         """,
-        (tool_name,),
-        as_dict=True,
-    )[0]
-    count = int(res["cnt"] or 0)
-    avg = float(res["avg"] or 0) if count else 0.0
-    frappe.db.set_value("Tool", tool_name, {
-        "review_count": count,
-        "average_rating": round(avg, 2),
-    })
+		as_dict=True,
+	)
+	for i in range(0, len(stale), BACKFILL_BATCH_SIZE):
+		batch = stale[i : i + BACKFILL_BATCH_SIZE]
+		_write_aggregates(batch)
+		# applied once the batch commits
+		bump_tools([r.name for r in batch])
+		frappe.db.commit()
+	facets.update_tools([r.name for r in stale])
+	frappe.logger("ai_tools_dir").info(
+		f"review aggregates backfill: {len(stale)} tools changed in {time.monotonic() - started:.2f}s"
+	)
+	return {"changed": len(stale)}
+
 
+def _write_aggregates(rows: list[dict]) -> None:
+	"""Write all aggregate columns for a batch of tools in one UPDATE."""
+	case = " ".join(["WHEN %s THEN %s"] * len(rows))
+	assignments = ", ".join(f"{f} = CASE name {case} END" for f in AGGREGATE_FIELDS)
+	args = []
+	for f in AGGREGATE_FIELDS:
+		cast = float if f == "average_rating" else int
+		args += [v for r in rows for v in (r.name, cast(r[f] or 0))]
+	args.append(tuple(r.name for r in rows))
+	frappe.db.sql(
+		f"UPDATE `tabTool` SET {assignments} WHERE name IN %s",
+		tuple(args),
+	)
@@ -0,0 +1,50 @@
+import frappe
+from frappe.website.utils import clear_website_cache
+
+from ai_tools_dir.api.moderation import clear_pending_counts
+from ai_tools_dir.utils import autocomplete, facets, static_journal
+from ai_tools_dir.utils.counts import clear_counts, refresh_category_counts
+from ai_tools_dir.utils.dedupe import remove_tools, rename_tool
+from ai_tools_dir.utils.page_cache import bump_tools
+
+
+def on_tool_change(doc, method=None, *args):
+	"""doc_events hook for single Tool saves, renames and deletes."""
+	if doc.flags.defer_tool_events:
+		# caller reports the whole batch through tools_changed
+		return
+	names = [doc.name]
+	# categories the tool may have left, which the current rows no longer point at
+	categories = [doc.category]
+	if method == "after_delete":
+		remove_tools(names)
+	elif method == "after_rename" and args:
+		# after_rename passes (old, new, merge)
+		names = [args[0], args[1]]
+		rename_tool(args[0], args[1])
+	elif method == "on_update":
+		before = doc.get_doc_before_save()
+		if before:
+			categories.append(before.category)
+	tools_changed(names, categories)
+
+
+def tools_changed(names: list[str], categories: list[str] | None = None) -> None:
+	"""Run derived-data side effects once for a batch of changed Tools.
+
+	Bulk paths (imports, moderation transitions) call this once per batch instead of
+	triggering per-document hooks. `categories` lists previous categories of tools
+	that moved or were deleted, so their counts are refreshed too.
+	"""
+	if not names:
+		return
+	current = frappe.get_all("Tool", filters={"name": ["in", names]}, pluck="category", distinct=True)
+	refresh_category_counts([*current, *(categories or [])])
+	clear_website_cache()
+	clear_pending_counts()
+	clear_counts()
+	autocomplete.update_tools(names)
+	facets.update_tools(names)
+	bump_tools(names)
+	# category pages the tools moved out of
+	static_journal.record(categories=categories or [])
@@ -32,7 +32,7 @@ app_description = "Directory of AI tools built with Frappe"
 # include js, css files in header of web template
 web_include_css = "/assets/ai_tools_dir/css/ai_tools.css"
 web_include_js = [
-    "/assets/ai_tools_dir/js/global_menu.js",
+	"/assets/ai_tools_dir/js/global_menu.js",
 ]
 
 # include custom scss in every website theme (without file extension ".scss")
@@ -48,7 +48,7 @@ web_include_js = [
 # include js in doctype views
 # doctype_js = {"doctype" : "public/js/doctype.js"}
 doctype_list_js = {
-    "Tool": "public/js/doctype_list/tool_list.js",
+	"Tool": "public/js/doctype_list/tool_list.js",
 }
 # doctype_tree_js = {"doctype" : "public/js/doctype_tree.js"}
 # doctype_calendar_js = {"doctype" : "public/js/doctype_calendar.js"}
@@ -69,6 +69,9 @@ home_page = "index"
 # 	"Role": "home_page"
 # }
 
+# Serve guest requests for the directory pages from the rendered-page cache
+page_renderer = ["ai_tools_dir.utils.page_cache.CachedTemplatePage"]
+
 # Generators
 # ----------
 
@@ -77,20 +80,19 @@ home_page = "index"
 
 # Website route redirects and dynamic routes
 website_route_rules = [
-    {"from_route": "/tool/<slug>", "to_route": "tools/<slug>"},
-    {"from_route": "/tools/<slug>", "to_route": "/tools/_slug"},
-    {"from_route": "/categories/<slug>", "to_route": "/categories/_slug"},
-    {"from_route": "/tools", "to_route": "/"},
+	{"from_route": "/tool/<slug>", "to_route": "tools/<slug>"},
+	{"from_route": "/tools/<slug>", "to_route": "/tools/_slug"},
+	{"from_route": "/categories/<slug>", "to_route": "/categories/_slug"},
+	{"from_route": "/tools", "to_route": "/"},
 ]
 
 # Jinja
 # ----------
 
 # add methods and filters to jinja environment
-# jinja = {
-# 	"methods": "ai_tools_dir.utils.jinja_methods",
-# 	"filters": "ai_tools_dir.utils.jinja_filters"
-# }
+jinja = {
+	"methods": ["ai_tools_dir.utils.votes.voted_tools"],
+}
 
 # Installation
 # ------------
@@ -151,20 +153,64 @@ after_install = "ai_tools_dir.install.after_install"
 # Hook on document methods and events
 
 doc_events = {
-    "Review": {
-        "after_insert": "ai_tools_dir.events.reviews.update_tool_aggregates",
-        "on_update": "ai_tools_dir.events.reviews.update_tool_aggregates",
-        "on_trash": "ai_tools_dir.events.reviews.update_tool_aggregates",
-    }
+	"Tool": {
+		"on_update": "ai_tools_dir.events.tools.on_tool_change",
+		# after_delete rather than on_trash: the row must be gone for counts and autocomplete
+		"after_delete": "ai_tools_dir.events.tools.on_tool_change",
+		"after_rename": "ai_tools_dir.events.tools.on_tool_change",
+	},
+	"Review": {
+		"after_insert": [
+			"ai_tools_dir.events.reviews.on_review_insert",
+			"ai_tools_dir.utils.page_cache.on_review_change",
+		],
+		"on_update": [
+			"ai_tools_dir.events.reviews.on_review_update",
+			"ai_tools_dir.utils.page_cache.on_review_change",
+		],
+		"on_trash": [
+			"ai_tools_dir.events.reviews.on_review_trash",
+			"ai_tools_dir.utils.page_cache.on_review_change",
+		],
+	},
+	"Tool Vote": {
+		"after_insert": [
+			"ai_tools_dir.utils.page_cache.on_vote_change",
+			"ai_tools_dir.utils.votes.clear_vote_state",
+		],
+		"on_trash": [
+			"ai_tools_dir.utils.page_cache.on_vote_change",
+			"ai_tools_dir.utils.votes.clear_vote_state",
+		],
+	},
+	"Category": {
+		"on_update": "ai_tools_dir.events.categories.on_category_change",
+		"on_trash": "ai_tools_dir.events.categories.on_category_change",
+		"after_rename": "ai_tools_dir.events.categories.on_category_change",
+	},
 }
 
 # Scheduled Tasks
 # ---------------
 
 scheduler_events = {
-    "hourly": [
-        "ai_tools_dir.events.reviews.backfill_all_tool_aggregates",
-    ]
+	"cron": {
+		"*/5 * * * *": [
+			"ai_tools_dir.utils.trending.drain_pending",
+		],
+		"*/10 * * * *": [
+			"ai_tools_dir.etl.static_export.scheduled_export",
+		],
+	},
+	"hourly": [
+		"ai_tools_dir.events.reviews.backfill_all_tool_aggregates",
+		"ai_tools_dir.etl.logos.process_pending_logos",
+		"ai_tools_dir.utils.ranking.recompute_all_scores",
+	],
+	"daily": [
+		"ai_tools_dir.utils.autocomplete.rebuild",
+		"ai_tools_dir.utils.facets.rebuild",
+	],
 }
 
 # Testing
@@ -197,8 +243,8 @@ scheduler_events = {
 
 # Request Events
 # ----------------
-# before_request = ["ai_tools_dir.utils.before_request"]
-# after_request = ["ai_tools_dir.utils.after_request"]
+before_request = ["ai_tools_dir.utils.profiler.before_request"]
+after_request = ["ai_tools_dir.utils.profiler.after_request"]
 
 # Job Events
 # ----------
@@ -245,6 +291,5 @@ scheduler_events = {
 
 # Public API endpoints
 override_whitelisted_methods = {
-    "ai_tools_dir.api.vote.toggle_upvote": "ai_tools_dir.api.vote.toggle_upvote",
+	"ai_tools_dir.api.vote.toggle_upvote": "ai_tools_dir.api.vote.toggle_upvote",
 }
-
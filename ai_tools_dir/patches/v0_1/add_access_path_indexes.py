@@ -0,0 +1,22 @@
+import frappe
+
+# (doctype, columns, index name). InnoDB appends the primary key (`name`) to every
+# secondary index, so these also serve the `..., name DESC` keyset tie-breakers.
+INDEXES = [
+	# homepage sorts over approved tools (utils/listing.SORTS)
+	("Tool", ["ingestion_status", "modified"], "ingestion_status_modified"),
+	("Tool", ["ingestion_status", "average_rating"], "ingestion_status_average_rating"),
+	# category pages and per-category/pricing counts
+	("Tool", ["category", "ingestion_status", "modified"], "category_ingestion_status_modified"),
+	("Tool", ["ingestion_status", "category", "pricing"], "ingestion_status_category_pricing"),
+	# api.vote.toggle_upvote (tool, user) and the per-user vote lookups
+	("Tool Vote", ["tool", "user"], "tool_user"),
+	("Tool Vote", ["user", "tool"], "user_tool"),
+	# review pages (tool, modified desc, name desc) and per-tool aggregates
+	("Review", ["tool", "modified"], "tool_modified"),
+]
+
+
+def execute():
+	for doctype, columns, index_name in INDEXES:
+		frappe.db.add_index(doctype, columns, index_name=index_name)
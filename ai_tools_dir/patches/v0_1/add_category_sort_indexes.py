@@ -0,0 +1,13 @@
+import frappe
+
+# category pages allow every utils/listing.SORTS ordering; modified and trending_score
+# are covered by add_access_path_indexes and add_trending_score_index
+INDEXES = [
+	("Tool", ["category", "ingestion_status", "ranking_score"], "category_ingestion_status_ranking_score"),
+	("Tool", ["category", "ingestion_status", "average_rating"], "category_ingestion_status_average_rating"),
+]
+
+
+def execute():
+	for doctype, columns, index_name in INDEXES:
+		frappe.db.add_index(doctype, columns, index_name=index_name)
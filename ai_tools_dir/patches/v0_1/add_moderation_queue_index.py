@@ -0,0 +1,8 @@
+import frappe
+
+
+def execute():
+	# api.moderation.get_queue reads pending tools in (creation, name) order
+	frappe.db.add_index(
+		"Tool", ["ingestion_status", "creation", "name"], index_name="ingestion_status_creation"
+	)
@@ -0,0 +1,10 @@
+import frappe
+
+from ai_tools_dir.utils.ranking import recompute_all_scores
+
+
+def execute():
+	frappe.db.add_index(
+		"Tool", ["ingestion_status", "ranking_score"], index_name="ingestion_status_ranking_score"
+	)
+	recompute_all_scores()
@@ -0,0 +1,18 @@
+import frappe
+
+from ai_tools_dir.utils.search import refresh_search_keywords
+
+
+def _has_index(name: str) -> bool:
+	return bool(frappe.db.sql("SHOW INDEX FROM `tabTool` WHERE Key_name = %s", (name,)))
+
+
+def execute():
+	if not _has_index("tool_fulltext"):
+		frappe.db.sql_ddl(
+			"ALTER TABLE `tabTool` ADD FULLTEXT INDEX `tool_fulltext` (tool_name, description, search_keywords)"
+		)
+	if not _has_index("tool_name_fulltext"):
+		frappe.db.sql_ddl("ALTER TABLE `tabTool` ADD FULLTEXT INDEX `tool_name_fulltext` (tool_name)")
+	refresh_search_keywords(frappe.get_all("Tool", pluck="name"))
+	frappe.db.commit()
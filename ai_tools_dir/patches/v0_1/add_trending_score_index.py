@@ -0,0 +1,12 @@
+import frappe
+
+
+def execute():
+	frappe.db.add_index(
+		"Tool", ["ingestion_status", "trending_score"], index_name="ingestion_status_trending_score"
+	)
+	frappe.db.add_index(
+		"Tool",
+		["category", "ingestion_status", "trending_score"],
+		index_name="category_ingestion_status_trending_score",
+	)
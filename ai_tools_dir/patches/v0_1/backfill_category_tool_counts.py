@@ -0,0 +1,5 @@
+from ai_tools_dir.utils.counts import refresh_category_counts
+
+
+def execute():
+	refresh_category_counts()
@@ -0,0 +1,6 @@
+from ai_tools_dir.events.reviews import backfill_all_tool_aggregates
+
+
+def execute():
+	# Seed rating_sum and the per-star counts that review hooks now maintain by delta
+	backfill_all_tool_aggregates()
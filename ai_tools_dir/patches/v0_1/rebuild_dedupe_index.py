@@ -0,0 +1,6 @@
+from ai_tools_dir.utils import dedupe
+
+
+def execute():
+	# website shingles now use the public suffix list; re-sign every tool
+	dedupe.rebuild()
@@ -0,0 +1,6 @@
+from ai_tools_dir.utils import facets
+
+
+def execute():
+	# tag bitmaps are now keyed by slug; rebuild instead of waiting for the daily job
+	facets.invalidate()
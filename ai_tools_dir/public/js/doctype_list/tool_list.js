@@ -1,3 +1,12 @@
+function show_transition_result(res, label) {
+	if (!res) return;
+	if (res.queued) {
+		frappe.show_alert({ message: `${res.total} tools queued (${res.job_id})`, indicator: "blue" });
+		return;
+	}
+	frappe.show_alert({ message: `${label}: ${res.updated} updated`, indicator: "green" });
+}
+
 frappe.listview_settings["Tool"] = {
 	onload(listview) {
 		// Quick filter for Pending Review
@@ -108,14 +117,16 @@ frappe.listview_settings["Tool"] = {
 		listview.page.add_actions_menu_item("Approve Selected", async () => {
 			const names = listview.get_checked_items().map((d) => d.name);
 			if (!names.length) return;
-			await frappe.call({ method: "ai_tools_dir.api.ingestion.bulk_approve", args: { names } });
+			const r = await frappe.call({ method: "ai_tools_dir.api.ingestion.bulk_approve", args: { names } });
+			show_transition_result(r.message, "Approved");
 			listview.refresh();
 		});
 
 		listview.page.add_actions_menu_item("Reject Selected", async () => {
 			const names = listview.get_checked_items().map((d) => d.name);
 			if (!names.length) return;
-			await frappe.call({ method: "ai_tools_dir.api.ingestion.bulk_reject", args: { names } });
+			const r = await frappe.call({ method: "ai_tools_dir.api.ingestion.bulk_reject", args: { names } });
+			show_transition_result(r.message, "Rejected");
 			listview.refresh();
 		});
 	},
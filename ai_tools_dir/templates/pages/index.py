@@ -1,78 +1,181 @@
 from __future__ import annotations
 
+from urllib.parse import urlencode
+
 import frappe
 
+from ai_tools_dir.utils import facets
+from ai_tools_dir.utils.counts import approved_count, capped_count
+from ai_tools_dir.utils.listing import (
+	LISTING_FIELDS,
+	NUMBERED_PAGES,
+	PAGE_SIZE,
+	clamp_page,
+	fetch_page,
+	normalize_sort,
+)
+from ai_tools_dir.utils.search import search_tools
+from ai_tools_dir.utils.votes import voted_tools
+
 
 def get_context(context):
-    # Request params
-    q = (frappe.form_dict.get("q") or "").strip()
-    sort = frappe.form_dict.get("sort") or "modified desc"
-    category_slug = frappe.form_dict.get("category") or ""
-    try:
-        page = int(frappe.form_dict.get("page") or 1)
-    except Exception:
-        page = 1
-
-    page_size = 24
-    start = (page - 1) * page_size
-
-    # Categories
-    categories = frappe.get_all("Category", fields=["name", "slug"])  # safe
-
-    # Build filters
-    filters = []
-    if q:
-        filters.append(["tool_name", "like", f"%{q}%"])  # safe like
-    if category_slug:
-        category_name = frappe.db.get_value("Category", {"slug": category_slug}, "name")
-        if category_name:
-            filters.append(["category", "=", category_name])
-    filters.append(["ingestion_status", "=", "Approved"])
-
-    # Query tools
-    tools = frappe.get_all(
-        "Tool",
-        fields=[
-            "name",
-            "tool_name",
-            "slug",
-            "pricing",
-            "logo",
-            "average_rating",
-            "upvote_count",
-        ],
-        filters=filters,
-        order_by=sort,
-        start=start,
-        limit=page_size,
-    )
-
-    # My votes (if logged in)
-    my_voted_tools = []
-    if frappe.session.user and frappe.session.user != "Guest":
-        votes = frappe.get_all("Tool Vote", fields=["tool"], filters={"user": frappe.session.user})
-        my_voted_tools = [v["tool"] for v in votes]
-
-    # Annotate tools with voted flag to avoid complex template logic
-    voted_set = set(my_voted_tools)
-    for t in tools:
-        t["voted_by_me"] = t.get("name") in voted_set
-
-    total = frappe.db.count("Tool", filters=filters)
-    total_pages = (total + page_size - 1) // page_size
-
-    # Expose to template
-    context.categories = categories
-    context.q = q
-    context.sort = sort
-    context.category_slug = category_slug
-    context.page = page
-    context.page_size = page_size
-    context.tools = tools
-    context.total = total
-    context.total_pages = total_pages
-    context.my_voted_tools = my_voted_tools
-
-    return context
+	# Request params
+	q = (frappe.form_dict.get("q") or "").strip()
+	sort = normalize_sort(frappe.form_dict.get("sort"))
+	category_slug = frappe.form_dict.get("category") or ""
+	cursor = frappe.form_dict.get("cursor") or None
+	# Deep pages are only reachable through cursors; numbered pages stop at NUMBERED_PAGES
+	page = clamp_page(frappe.form_dict.get("page"))
+
+	page_size = PAGE_SIZE
+
+	# Categories
+	categories = frappe.get_all("Category", fields=["name", "slug"])  # safe
+
+	# Build filters
+	conditions, params = [], {}
+	category_name = None
+	if category_slug:
+		category_name = frappe.db.get_value("Category", {"slug": category_slug}, "name")
+		if category_name:
+			conditions.append("category = %(category)s")
+			params["category"] = category_name
+
+	# Pricing / minimum rating / tag facets, answered from the facet bitmaps
+	filters = facets.normalize_filters(frappe.form_dict)
+	faceted = bool(filters["pricing"] or filters["min_rating"] or filters["tags"])
+	facet_counts = None if q else facets.facet_counts(category_name, filters, [c.name for c in categories])
+
+	next_cursor = None
+	total_capped = False
+	if q:
+		# Full-text search, ordered by relevance
+		facet_conditions, facet_params = facets.sql_conditions(filters)
+		tools, total, total_capped = search_tools(
+			q,
+			LISTING_FIELDS,
+			filters_sql="".join(f" AND {c}" for c in conditions + facet_conditions),
+			params={**params, **facet_params},
+			start=(page - 1) * page_size,
+			limit=page_size,
+		)
+		cursor = None
+	else:
+		if faceted:
+			names = facets.matching_names(category_name, filters)
+			if names is None:
+				# too many matches for an IN list; the SQL predicates select the same tools
+				facet_conditions, facet_params = facets.sql_conditions(filters)
+				conditions += facet_conditions
+				params.update(facet_params)
+			else:
+				conditions.append("name IN %(facet_names)s")
+				params["facet_names"] = tuple(names) or ("",)
+		tools, next_cursor = fetch_page(
+			conditions, params, sort=sort, cursor=cursor, page=page, page_size=page_size
+		)
+		if not faceted:
+			total = approved_count(category=category_name)
+		elif facet_counts:
+			total = facet_counts["total"]
+		else:
+			total, total_capped = capped_count(
+				" AND ".join(["ingestion_status = 'Approved'", *conditions]), params
+			)
+
+	# My votes among the visible tools (empty for guests)
+	voted_set = voted_tools([t["name"] for t in tools])
+	my_voted_tools = [t["name"] for t in tools if t["name"] in voted_set]
+
+	# Annotate tools with voted flag to avoid complex template logic
+	for t in tools:
+		t["voted_by_me"] = t.get("name") in voted_set
+
+	total_pages = (total + page_size - 1) // page_size
+
+	# Guest renders are cached by utils.page_cache, keyed by query params;
+	# keep Frappe's path-only website cache out of the way
+	context.no_cache = 1
+
+	# Expose to template
+	context.categories = categories
+	context.q = q
+	context.sort = sort
+	context.category_slug = category_slug
+	context.page = page
+	context.page_size = page_size
+	context.tools = tools
+	context.total = total
+	context.total_capped = total_capped
+	context.total_pages = total_pages
+	context.numbered_pages = min(total_pages, NUMBERED_PAGES)
+	context.cursor = cursor
+	# Past the numbered pages, "Next" follows the keyset cursor
+	context.next_cursor = next_cursor if (cursor or page >= NUMBERED_PAGES) else None
+	context.my_voted_tools = my_voted_tools
+	context.filters = filters
+	listing_params = _listing_params(q, sort, category_slug, filters)
+	context.listing_query = urlencode(listing_params)
+	context.facets = _facet_options(facet_counts, filters, categories, listing_params)
+
+	return context
+
+
+def _listing_params(q: str, sort: str, category_slug: str, filters: dict) -> dict:
+	"""Query params that define the current listing (everything but the page position)."""
+	params = {
+		"q": q,
+		"sort": sort,
+		"category": category_slug,
+		"pricing": filters["pricing"],
+		"min_rating": filters["min_rating"],
+		"tag": ",".join(filters["tags"]),
+	}
+	return {k: v for k, v in params.items() if v}
+
+
+def _facet_options(counts: dict | None, filters: dict, categories: list, current: dict) -> dict:
+	"""Facet options for the template: label, count (None while searching), active flag, href."""
+	counts = (counts or {}).get("counts", {})
 
+	def option(facet, param, value, label, active, new_value):
+		query = {**current, param: new_value}
+		return {
+			"label": label,
+			"count": counts.get(facet, {}).get(value),
+			"active": active,
+			"href": "/?" + urlencode({k: v for k, v in query.items() if v}),
+		}
 
+	tags = filters["tags"]
+	return {
+		"pricing": [
+			option(
+				"pricing", "pricing", p, p, filters["pricing"] == p, None if filters["pricing"] == p else p
+			)
+			for p in facets.PRICING
+		],
+		"min_rating": [
+			option(
+				"min_rating",
+				"min_rating",
+				n,
+				f"{n}★ & up",
+				filters["min_rating"] == n,
+				None if filters["min_rating"] == n else n,
+			)
+			for n in facets.MIN_RATINGS
+		],
+		"tags": [
+			option(
+				"tags",
+				"tag",
+				t,
+				t,
+				t in tags,
+				",".join(x for x in tags if x != t) if t in tags else ",".join([*tags, t]),
+			)
+			for t in (list(counts.get("tags", {})) or tags)
+		],
+		"category": {c.name: counts.get("category", {}).get(c.name) for c in categories},
+	}
@@ -0,0 +1,187 @@
+"""Typeahead index of approved tool names and categories held in Redis.
+
+Every entry is a member of one sorted set with score 0, so Redis orders members
+lexicographically and a prefix lookup is a single ZRANGEBYLEX (O(log N + M)). Members
+look like "<normalized term>\\x00<kind>\\x00<docname>"; a tool is indexed under its full
+name and under each later word, so "gpt" finds "Chat GPT". Display labels and weights
+live in a hash, and the members each document contributed are remembered so renames,
+edits and rejections can be applied incrementally.
+
+Lexicographic order says nothing about weight, so a lookup pages through every match
+(up to MAX_CANDIDATES members) and ranks them, rather than ranking only the first page.
+"""
+
+import heapq
+import json
+import re
+
+import frappe
+import redis
+from frappe.utils import cstr
+
+from ai_tools_dir.utils.ranking import global_mean
+
+ENTRIES_KEY = "ai_tools_dir:autocomplete:entries"
+META_KEY = "ai_tools_dir:autocomplete:meta"
+MEMBERS_KEY = "ai_tools_dir:autocomplete:members"
+BUILT_KEY = "ai_tools_dir:autocomplete:built"
+REBUILD_LOCK_KEY = "ai_tools_dir:autocomplete:rebuild_lock"
+SCAN_PAGE = 500
+# hard cap on members ranked per lookup; only one- or two-letter prefixes on very
+# large catalogues reach it
+MAX_CANDIDATES = 5000
+SEP = "\x00"
+_NORMALIZE = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def normalize(text: str) -> str:
+	return _NORMALIZE.sub(" ", cstr(text).lower()).strip()
+
+
+def _terms(label: str) -> list[str]:
+	words = normalize(label).split()
+	return list(dict.fromkeys(" ".join(words[i:]) for i in range(len(words))))
+
+
+def _entry_id(kind: str, name: str) -> str:
+	return f"{kind}{SEP}{name}"
+
+
+def _remove_entries(pipe, cache, entry_ids: list[str]) -> None:
+	key = cache.make_key
+	existing = redis.Redis.hmget(cache, key(MEMBERS_KEY), entry_ids) if entry_ids else []
+	for entry_id, members in zip(entry_ids, existing, strict=True):
+		if members:
+			pipe.zrem(key(ENTRIES_KEY), *json.loads(members))
+		pipe.hdel(key(MEMBERS_KEY), entry_id)
+		pipe.hdel(key(META_KEY), entry_id)
+
+
+def _add_entry(pipe, cache, kind: str, name: str, label: str, url: str, weight: float) -> None:
+	key = cache.make_key
+	entry_id = _entry_id(kind, name)
+	members = [f"{term}{SEP}{entry_id}" for term in _terms(label)]
+	if not members:
+		return
+	pipe.zadd(key(ENTRIES_KEY), dict.fromkeys(members, 0))
+	pipe.hset(key(MEMBERS_KEY), entry_id, json.dumps(members))
+	pipe.hset(
+		key(META_KEY), entry_id, json.dumps({"label": label, "url": url, "weight": weight, "type": kind})
+	)
+
+
+def update_tools(names: list[str]) -> None:
+	"""Re-index tools after approval, rejection, rename or edit; unknown names are removed."""
+	names = [n for n in names if n]
+	if not names:
+		return
+	cache = frappe.cache()
+	rows = {
+		r.name: r
+		for r in frappe.get_all(
+			"Tool",
+			filters={"name": ["in", names], "ingestion_status": "Approved"},
+			fields=["name", "tool_name", "slug", "ranking_score"],
+		)
+	}
+	pipe = cache.pipeline(transaction=False)
+	_remove_entries(pipe, cache, [_entry_id("tool", n) for n in names])
+	for r in rows.values():
+		_add_entry(pipe, cache, "tool", r.name, r.tool_name, f"/tools/{r.slug}", float(r.ranking_score or 0))
+	pipe.execute()
+
+
+def _category_rows(names: list[str] | None = None) -> list[dict]:
+	return frappe.db.sql(
+		f"""
+		SELECT c.name, c.slug, COUNT(t.name) AS cnt
+		FROM `tabCategory` c
+		LEFT JOIN `tabTool` t ON t.category = c.name AND t.ingestion_status = 'Approved'
+		{"WHERE c.name IN %(names)s" if names is not None else ""}
+		GROUP BY c.name, c.slug
+		""",
+		{"names": tuple(names or ())},
+		as_dict=True,
+	)
+
+
+def _add_category(pipe, cache, c, mean: float) -> None:
+	# Categories rank above tools with the same prefix when they hold many tools
+	_add_entry(pipe, cache, "category", c.name, c.name, f"/categories/{c.slug}", mean + c.cnt)
+
+
+def remove_categories(names: list[str]) -> None:
+	cache = frappe.cache()
+	pipe = cache.pipeline(transaction=False)
+	_remove_entries(pipe, cache, [_entry_id("category", n) for n in names if n])
+	pipe.execute()
+
+
+def update_categories(names: list[str]) -> None:
+	"""Re-index categories after a save, rename or delete; unknown names are removed."""
+	names = list(dict.fromkeys(n for n in names if n))
+	if not names:
+		return
+	cache = frappe.cache()
+	pipe = cache.pipeline(transaction=False)
+	_remove_entries(pipe, cache, [_entry_id("category", n) for n in names])
+	mean = global_mean()
+	for c in _category_rows(names):
+		_add_category(pipe, cache, c, mean)
+	pipe.execute()
+
+
+def rebuild() -> dict:
+	"""Build the whole index from scratch (daily, and lazily when the index is missing)."""
+	cache = frappe.cache()
+	key = cache.make_key
+	tools = frappe.get_all(
+		"Tool",
+		filters={"ingestion_status": "Approved"},
+		fields=["name", "tool_name", "slug", "ranking_score"],
+	)
+	categories = _category_rows()
+	pipe = cache.pipeline(transaction=True)
+	pipe.delete(key(ENTRIES_KEY), key(META_KEY), key(MEMBERS_KEY))
+	for r in tools:
+		_add_entry(pipe, cache, "tool", r.name, r.tool_name, f"/tools/{r.slug}", float(r.ranking_score or 0))
+	mean = global_mean()
+	for c in categories:
+		_add_category(pipe, cache, c, mean)
+	pipe.set(key(BUILT_KEY), 1)
+	pipe.delete(key(REBUILD_LOCK_KEY))
+	pipe.execute()
+	return {"tools": len(tools), "categories": len(categories)}
+
+
+def _ensure_built(cache) -> None:
+	key = cache.make_key
+	if redis.Redis.exists(cache, key(BUILT_KEY)):
+		return
+	# queue a single rebuild; requests serve whatever is there meanwhile
+	if redis.Redis.set(cache, key(REBUILD_LOCK_KEY), 1, nx=True, ex=600):
+		frappe.enqueue("ai_tools_dir.utils.autocomplete.rebuild", queue="long")
+
+
+def suggest(prefix: str, limit: int = 8) -> list[dict]:
+	"""Top `limit` entries whose name (or a word in it) starts with `prefix`, by weight."""
+	term = normalize(prefix)
+	if not term:
+		return []
+	cache = frappe.cache()
+	key = cache.make_key
+	_ensure_built(cache)
+	lo = b"[" + term.encode()
+	hi = lo + b"\xff"
+	seen, ranked = set(), []
+	for offset in range(0, MAX_CANDIDATES, SCAN_PAGE):
+		members = redis.Redis.zrangebylex(cache, key(ENTRIES_KEY), lo, hi, start=offset, num=SCAN_PAGE)
+		entry_ids = [e for e in dict.fromkeys(cstr(m).split(SEP, 1)[1] for m in members) if e not in seen]
+		seen.update(entry_ids)
+		if entry_ids:
+			metas = redis.Redis.hmget(cache, key(META_KEY), entry_ids)
+			ranked.extend(json.loads(m) for m in metas if m)
+			ranked = heapq.nsmallest(limit, ranked, key=lambda r: (-r["weight"], r["label"].lower()))
+		if len(members) < SCAN_PAGE:
+			break
+	return [{"type": r["type"], "label": r["label"], "url": r["url"]} for r in ranked]
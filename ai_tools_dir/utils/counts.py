@@ -0,0 +1,127 @@
+"""Cached approved-tool counts for the listing pager.
+
+Counts for every (category, pricing) combination, including the "any" rollups, come
+from one GROUP BY and are kept in a Redis hash until a Tool change clears it (see
+events.tools.tools_changed). Clearing waits for the writing transaction to commit, so
+readers never recount pre-commit rows into a fresh hash. The hash is also versioned:
+clearing bumps the version rather than deleting the hash a reader may be about to
+repopulate, so a recount that raced a clear lands under the old version, is never read,
+and expires. Free-text searches are counted with a capped subquery instead, so the
+pager never costs a second full scan.
+
+Per-category totals are also materialized on Category.approved_tool_count for the
+categories index; `refresh_category_counts` recounts only the categories a batch of
+Tool changes touched.
+"""
+
+import frappe
+import redis
+
+from ai_tools_dir.utils import profiler
+
+COUNTS_KEY = "ai_tools_dir:counts:approved"
+VERSION_KEY = "ai_tools_dir:counts:version"
+COUNTS_TTL = 24 * 3600
+ANY = "*"
+SEARCH_COUNT_CAP = 1000
+
+
+def _field(category: str | None, pricing: str | None) -> str:
+	return f"{category or ANY}|{pricing or ANY}"
+
+
+def _hash_key(cache) -> str:
+	version = int(redis.Redis.get(cache, cache.make_key(VERSION_KEY)) or 0)
+	return cache.make_key(f"{COUNTS_KEY}:{version}")
+
+
+def _rebuild(cache, key: str) -> dict:
+	rows = frappe.db.sql(
+		"""
+		SELECT COALESCE(category, '') AS category, COALESCE(pricing, '') AS pricing, COUNT(*) AS cnt
+		FROM `tabTool`
+		WHERE ingestion_status = 'Approved'
+		GROUP BY category, pricing
+		""",
+		as_dict=True,
+	)
+	counts: dict[str, int] = {_field(None, None): 0}
+	for r in rows:
+		category, pricing = r.category or None, r.pricing or None
+		# each group contributes to its exact combination and to the "any" rollups
+		for c in {category, None}:
+			for p in {pricing, None}:
+				field = _field(c, p)
+				counts[field] = counts.get(field, 0) + r.cnt
+	pipe = cache.pipeline(transaction=True)
+	pipe.delete(key)
+	pipe.hset(key, mapping=counts)
+	pipe.expire(key, COUNTS_TTL)
+	pipe.execute()
+	return counts
+
+
+def approved_count(category: str | None = None, pricing: str | None = None) -> int:
+	"""Number of approved tools, optionally within one category and/or pricing tier."""
+	cache = frappe.cache()
+	key = _hash_key(cache)
+	value = redis.Redis.hget(cache, key, _field(category, pricing))
+	profiler.note_cache("counts", value is not None)
+	if value is not None:
+		return int(value)
+	if redis.Redis.exists(cache, key):
+		# populated hash without this combination: there are no such tools
+		return 0
+	return _rebuild(cache, key).get(_field(category, pricing), 0)
+
+
+def clear_counts() -> None:
+	"""Drop the cached counts once the current transaction commits."""
+	if getattr(frappe.local, "ai_tools_clear_counts", False):
+		return
+	frappe.local.ai_tools_clear_counts = True
+	frappe.db.after_commit.add(_clear_now)
+	frappe.db.after_rollback.add(_discard_clear)
+
+
+def _discard_clear() -> None:
+	frappe.local.ai_tools_clear_counts = False
+
+
+def _clear_now() -> None:
+	frappe.local.ai_tools_clear_counts = False
+	cache = frappe.cache()
+	old = _hash_key(cache)
+	redis.Redis.incr(cache, cache.make_key(VERSION_KEY))
+	redis.Redis.delete(cache, old)
+
+
+def capped_count(where_sql: str, params: dict, cap: int = SEARCH_COUNT_CAP) -> tuple[int, bool]:
+	"""COUNT(*) that stops after `cap` matches. Returns (count, capped)."""
+	n = frappe.db.sql(
+		f"SELECT COUNT(*) FROM (SELECT 1 FROM `tabTool` WHERE {where_sql} LIMIT %(count_cap)s) matches",
+		{**params, "count_cap": cap + 1},
+	)[0][0]
+	return min(n, cap), n > cap
+
+
+def refresh_category_counts(categories: list[str] | None = None) -> None:
+	"""Recount Category.approved_tool_count for `categories` (all when None).
+
+	Each count is an index range read on (category, ingestion_status, ...).
+	"""
+	if categories is not None:
+		categories = tuple({c for c in categories if c})
+		if not categories:
+			return
+	frappe.db.sql(
+		f"""
+		UPDATE `tabCategory` c
+		SET c.approved_tool_count = (
+			SELECT COUNT(*) FROM `tabTool` t
+			WHERE t.category = c.name AND t.ingestion_status = 'Approved'
+		)
+		{"WHERE c.name IN %(categories)s" if categories is not None else ""}
+		""",
+		{"categories": categories},
+	)
@@ -0,0 +1,254 @@
+"""Near-duplicate Tool detection with MinHash signatures and LSH banding.
+
+Each tool is reduced to a set of shingles (name character trigrams, description word
+trigrams and its registrable website domain), summarised as a NUM_PERM MinHash
+signature and split into BANDS bands. Tools that share any band bucket are candidates;
+their signature agreement estimates Jaccard similarity. Lookups therefore touch a few
+buckets instead of every other tool.
+
+Signatures live in a Redis hash and every band bucket is a Redis set, so indexing,
+removing or renaming one tool touches only that tool's BANDS buckets and concurrent
+workers never overwrite each other. The importer updates the index incrementally,
+Tool deletes and renames are applied by events.tools, and a missing index is rebuilt
+in a background job. Likely duplicates are flagged on Tool for moderators.
+"""
+
+import hashlib
+import random
+import re
+from array import array
+
+import frappe
+import redis
+import tldextract
+from frappe.utils import cstr, strip_html
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DUPLICATE_THRESHOLD = 0.5
+SIGNATURES_KEY = "ai_tools_dir:dedupe:signatures"
+BUCKET_KEY = "ai_tools_dir:dedupe:bucket:"
+BUILT_KEY = "ai_tools_dir:dedupe:built"
+REBUILD_LOCK_KEY = "ai_tools_dir:dedupe:rebuild_lock"
+REBUILD_BATCH = 1000
+
+_MERSENNE = (1 << 61) - 1
+_rng = random.Random(1337)
+_PERMS = [(_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(NUM_PERM)]
+_WORD = re.compile(r"[a-z0-9]+")
+_NAME_NOISE = {"ai", "the", "app", "io", "com", "tool", "tools"}
+# bundled public suffix snapshot only; never fetch the list from a web worker
+_TLD = tldextract.TLDExtract(suffix_list_urls=())
+
+
+def _registrable_domain(website: str) -> str:
+	host = re.sub(r"^[a-z]+://", "", cstr(website).strip().lower()).split("/")[0].split(":")[0]
+	return _TLD(host).domain
+
+
+def shingles(tool_name: str, description: str, website: str) -> set[str]:
+	name_words = [w for w in _WORD.findall(cstr(tool_name).lower()) if w not in _NAME_NOISE]
+	name = " ".join(name_words)
+	out = {f"n:{name[i : i + 3]}" for i in range(max(len(name) - 2, 1))} if name else set()
+	words = _WORD.findall(strip_html(cstr(description)).lower())
+	out.update(f"d:{' '.join(words[i : i + 3])}" for i in range(max(len(words) - 2, 0)))
+	domain = _registrable_domain(website)
+	if domain:
+		out.add(f"w:{domain}")
+	return out
+
+
+def _hash64(value: str) -> int:
+	return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "little")
+
+
+def minhash(items: set[str]) -> array:
+	sig = array("I", [0xFFFFFFFF] * NUM_PERM)
+	for x in map(_hash64, items):
+		for i, (a, b) in enumerate(_PERMS):
+			h = ((a * x + b) % _MERSENNE) & 0xFFFFFFFF
+			if h < sig[i]:
+				sig[i] = h
+	return sig
+
+
+def _band_keys(sig: array) -> list[str]:
+	return [
+		f"{b}:{hashlib.blake2b(sig[b * ROWS : (b + 1) * ROWS].tobytes(), digest_size=8).hexdigest()}"
+		for b in range(BANDS)
+	]
+
+
+def similarity(a: array, b: array) -> float:
+	return sum(1 for x, y in zip(a, b, strict=True) if x == y) / NUM_PERM
+
+
+def _decode(raw: bytes | None) -> array | None:
+	if not raw:
+		return None
+	sig = array("I")
+	sig.frombytes(raw)
+	return sig if len(sig) == NUM_PERM else None
+
+
+class MinHashIndex:
+	"""The LSH index in Redis: one signature hash plus one set per band bucket."""
+
+	def __init__(self):
+		self.cache = frappe.cache()
+
+	def _bucket(self, band_key: str) -> str:
+		return self.cache.make_key(BUCKET_KEY + band_key)
+
+	def signature(self, name: str) -> array | None:
+		return _decode(redis.Redis.hget(self.cache, self.cache.make_key(SIGNATURES_KEY), name))
+
+	def _unlink(self, pipe, name: str, sig: array | None) -> None:
+		if sig is not None:
+			for key in _band_keys(sig):
+				pipe.srem(self._bucket(key), name)
+		pipe.hdel(self.cache.make_key(SIGNATURES_KEY), name)
+
+	def _link(self, pipe, name: str, sig: array) -> None:
+		for key in _band_keys(sig):
+			pipe.sadd(self._bucket(key), name)
+		pipe.hset(self.cache.make_key(SIGNATURES_KEY), name, sig.tobytes())
+
+	def upsert(self, name: str, sig: array) -> None:
+		pipe = self.cache.pipeline(transaction=True)
+		self._unlink(pipe, name, self.signature(name))
+		self._link(pipe, name, sig)
+		pipe.execute()
+
+	def remove(self, name: str) -> None:
+		pipe = self.cache.pipeline(transaction=True)
+		self._unlink(pipe, name, self.signature(name))
+		pipe.execute()
+
+	def rename(self, old: str, new: str) -> None:
+		sig = self.signature(old)
+		if sig is None:
+			return
+		pipe = self.cache.pipeline(transaction=True)
+		self._unlink(pipe, old, sig)
+		self._link(pipe, new, sig)
+		pipe.execute()
+
+	def best_match(self, name: str, sig: array) -> tuple[str | None, float]:
+		"""Most similar other tool sharing at least one band with `sig`."""
+		pipe = self.cache.pipeline(transaction=False)
+		for key in _band_keys(sig):
+			pipe.smembers(self._bucket(key))
+		candidates = {cstr(m) for members in pipe.execute() for m in members}
+		candidates.discard(name)
+		if not candidates:
+			return None, 0.0
+		# sorted so ties resolve to the lowest name, as before
+		candidates = sorted(candidates)
+		signatures = redis.Redis.hmget(self.cache, self.cache.make_key(SIGNATURES_KEY), candidates)
+		best, best_score = None, 0.0
+		for other, raw in zip(candidates, signatures, strict=True):
+			other_sig = _decode(raw)
+			if other_sig is None:
+				continue
+			score = similarity(sig, other_sig)
+			if score > best_score:
+				best, best_score = other, score
+		return best, best_score
+
+
+def _ensure_built(cache) -> None:
+	"""Queue a full rebuild if the index is missing (new site, Redis flushed or evicted)."""
+	if redis.Redis.exists(cache, cache.make_key(BUILT_KEY)):
+		return
+	if redis.Redis.set(cache, cache.make_key(REBUILD_LOCK_KEY), 1, nx=True, ex=3600):
+		frappe.enqueue("ai_tools_dir.utils.dedupe.rebuild", queue="long", timeout=3600)
+
+
+def _signature_for(row: dict) -> array:
+	return minhash(shingles(row.tool_name, row.description, row.website))
+
+
+def index_tools(names: list[str]) -> dict:
+	"""Add or refresh `names` in the index and flag likely duplicates."""
+	names = [n for n in names if n]
+	if not names:
+		return {"indexed": 0, "flagged": 0}
+	index = MinHashIndex()
+	_ensure_built(index.cache)
+	flagged = 0
+	rows = frappe.get_all(
+		"Tool",
+		filters={"name": ["in", names]},
+		fields=["name", "tool_name", "description", "website", "possible_duplicate_of"],
+	)
+	for row in rows:
+		sig = _signature_for(row)
+		index.upsert(row.name, sig)
+		match, score = index.best_match(row.name, sig)
+		if score < DUPLICATE_THRESHOLD:
+			match, score = None, 0.0
+		if match or row.possible_duplicate_of:
+			frappe.db.set_value(
+				"Tool",
+				row.name,
+				{"possible_duplicate_of": match, "duplicate_score": round(score, 3)},
+				update_modified=False,
+			)
+		flagged += bool(match)
+	return {"indexed": len(rows), "flagged": flagged}
+
+
+def remove_tools(names: list[str]) -> None:
+	"""Drop deleted tools from the index and clear flags that pointed at them."""
+	names = [n for n in names if n]
+	if not names:
+		return
+	index = MinHashIndex()
+	for name in names:
+		index.remove(name)
+	frappe.db.sql(
+		"""
+		UPDATE `tabTool` SET possible_duplicate_of = NULL, duplicate_score = 0
+		WHERE possible_duplicate_of IN %(names)s
+		""",
+		{"names": tuple(names)},
+	)
+
+
+def rename_tool(old: str, new: str) -> None:
+	"""Move a renamed tool's signature and buckets; Frappe relinks possible_duplicate_of."""
+	MinHashIndex().rename(old, new)
+
+
+def rebuild() -> dict:
+	"""Rebuild the index from every Tool. Flags are not rewritten; use index_tools for that."""
+	cache = frappe.cache()
+	key = cache.make_key
+	redis.Redis.set(cache, key(REBUILD_LOCK_KEY), 1, ex=3600)
+	try:
+		stale = [
+			k
+			for k in redis.Redis.scan_iter(cache, match=key("ai_tools_dir:dedupe:") + "*")
+			if cstr(k) != key(REBUILD_LOCK_KEY)
+		]
+		if stale:
+			redis.Redis.delete(cache, *stale)
+		index = MinHashIndex()
+		rows = frappe.get_all("Tool", fields=["name", "tool_name", "description", "website"])
+		for start in range(0, len(rows), REBUILD_BATCH):
+			pipe = cache.pipeline(transaction=False)
+			for row in rows[start : start + REBUILD_BATCH]:
+				index._link(pipe, row.name, _signature_for(row))
+			pipe.execute()
+		redis.Redis.set(cache, key(BUILT_KEY), 1)
+	finally:
+		redis.Redis.delete(cache, key(REBUILD_LOCK_KEY))
+	return {"indexed": len(rows)}
+
+
+@frappe.whitelist()
+def rebuild_index() -> dict:
+	frappe.only_for("System Manager")
+	return rebuild()
@@ -0,0 +1,291 @@
+"""Facet counts and filters for the homepage from per-facet Redis bitmaps.
+
+Every tool gets a dense integer id (`IDS_KEY`/`NAMES_KEY`) and each facet value is a
+bitmap with the ids of approved tools having it: all approved tools, each category,
+each pricing tier, "average rating >= n" for n in MIN_RATINGS, and each tag. Counting
+an option under the current filters is a BITOP AND plus a BITCOUNT; all options are
+counted in one pipeline. The bitmaps a tool contributes to are remembered so Tool
+changes are applied incrementally (see events.tools.tools_changed); `rebuild` runs
+daily and is queued whenever the structure is missing.
+
+Facets are single-select except tags, which are ANDed. An option's count applies the
+filters of the other facets, so sibling options show what choosing them would give.
+Tags are reduced to lowercase slugs (`[a-z0-9-]`), both when indexed and when read
+from the request, so a filter can only name a tag the index could contain.
+"""
+
+import json
+import re
+import uuid
+
+import frappe
+import redis
+from frappe.utils import cint, cstr, flt
+
+PREFIX = "ai_tools_dir:facets:"
+IDS_KEY = PREFIX + "ids"
+NAMES_KEY = PREFIX + "names"
+NEXT_ID_KEY = PREFIX + "next_id"
+MEMBERS_KEY = PREFIX + "members"
+TAG_COUNTS_KEY = PREFIX + "tag_counts"
+BUILT_KEY = PREFIX + "built"
+REBUILD_LOCK_KEY = PREFIX + "rebuild_lock"
+PRICING = ("Free", "Freemium", "Paid")
+MIN_RATINGS = (4, 3, 2, 1)
+TOP_TAGS = 20
+# above this many matches the listing filters with SQL predicates instead of name IN (...)
+MAX_IN_NAMES = 2000
+BATCH_SIZE = 1000
+FACET_FIELDS = ["name", "ingestion_status", "category", "pricing", "average_rating", "tags"]
+MAX_TAG_FILTERS = 5
+MAX_TAG_LENGTH = 40
+_TAG_NOISE = re.compile(r"[^a-z0-9]+")
+
+
+def _bits(facet: str, value=None) -> str:
+	return f"{PREFIX}bits:{facet}" if value is None else f"{PREFIX}bits:{facet}:{value}"
+
+
+def tag_slug(tag: str) -> str:
+	return _TAG_NOISE.sub("-", cstr(tag).lower()).strip("-")[:MAX_TAG_LENGTH]
+
+
+def split_tags(tags: str | None) -> list[str]:
+	return list(dict.fromkeys(filter(None, map(tag_slug, cstr(tags).split(",")))))
+
+
+def _tool_bitmaps(row) -> list[str]:
+	if not row or row.ingestion_status != "Approved":
+		return []
+	keys = [_bits("all")]
+	if row.category:
+		keys.append(_bits("category", row.category))
+	if row.pricing:
+		keys.append(_bits("pricing", row.pricing))
+	keys += [_bits("rating", n) for n in MIN_RATINGS if flt(row.average_rating) >= n]
+	keys += [_bits("tag", t) for t in split_tags(row.tags)]
+	return keys
+
+
+def _ensure_ids(cache, names: list[str]) -> dict[str, int]:
+	key = cache.make_key
+	ids = dict(zip(names, redis.Redis.hmget(cache, key(IDS_KEY), names), strict=True))
+	missing = [n for n, i in ids.items() if i is None]
+	if missing:
+		last = redis.Redis.incrby(cache, key(NEXT_ID_KEY), len(missing))
+		pipe = cache.pipeline(transaction=False)
+		for offset, name in enumerate(missing):
+			pipe.hsetnx(key(IDS_KEY), name, last - len(missing) + offset)
+		pipe.execute()
+		# a concurrent writer may have won HSETNX for some names
+		ids.update(zip(missing, redis.Redis.hmget(cache, key(IDS_KEY), missing), strict=True))
+		pipe = cache.pipeline(transaction=False)
+		for name in missing:
+			pipe.hset(key(NAMES_KEY), ids[name], name)
+		pipe.execute()
+	return {n: int(i) for n, i in ids.items()}
+
+
+def _apply(cache, rows: dict, names: list[str]) -> None:
+	"""Move each named tool's bits from what it contributed before to what `rows` says."""
+	key = cache.make_key
+	previous = redis.Redis.hmget(cache, key(MEMBERS_KEY), names)
+	ids = _ensure_ids(cache, names)
+	pipe = cache.pipeline(transaction=False)
+	for name, before in zip(names, previous, strict=True):
+		old = set(json.loads(before)) if before else set()
+		new = set(_tool_bitmaps(rows.get(name)))
+		for bitmap in old - new:
+			pipe.setbit(key(bitmap), ids[name], 0)
+		for bitmap in new - old:
+			pipe.setbit(key(bitmap), ids[name], 1)
+		tag_prefix = _bits("tag", "")
+		for bitmap, delta in [*((b, -1) for b in old - new), *((b, 1) for b in new - old)]:
+			if bitmap.startswith(tag_prefix):
+				pipe.zincrby(key(TAG_COUNTS_KEY), delta, bitmap[len(tag_prefix) :])
+		if new:
+			pipe.hset(key(MEMBERS_KEY), name, json.dumps(sorted(new)))
+		else:
+			pipe.hdel(key(MEMBERS_KEY), name)
+	pipe.zremrangebyscore(key(TAG_COUNTS_KEY), "-inf", 0)
+	pipe.execute()
+
+
+def update_tools(names: list[str]) -> None:
+	"""Apply Tool changes (approval, edits, new ratings, deletes) to the bitmaps."""
+	names = list(dict.fromkeys(n for n in names if n))
+	cache = frappe.cache()
+	if not names or not redis.Redis.exists(cache, cache.make_key(BUILT_KEY)):
+		# not built yet; the next read builds from the database
+		return
+	for start in range(0, len(names), BATCH_SIZE):
+		batch = names[start : start + BATCH_SIZE]
+		rows = {
+			r.name: r for r in frappe.get_all("Tool", filters={"name": ["in", batch]}, fields=FACET_FIELDS)
+		}
+		_apply(cache, rows, batch)
+
+
+def invalidate() -> None:
+	"""Force a rebuild on next use, e.g. after a Category rename rewrote Tool links."""
+	cache = frappe.cache()
+	redis.Redis.delete(cache, cache.make_key(BUILT_KEY))
+
+
+def rebuild() -> dict:
+	"""Rebuild every bitmap from the database (daily, and queued when missing).
+
+	Readers fall back to SQL while the rebuild lock is held.
+	"""
+	cache = frappe.cache()
+	key = cache.make_key
+	redis.Redis.set(cache, key(REBUILD_LOCK_KEY), 1, ex=300)
+	try:
+		stale = [
+			k
+			for k in redis.Redis.scan_iter(cache, match=key(PREFIX) + "*")
+			if cstr(k) != key(REBUILD_LOCK_KEY)
+		]
+		if stale:
+			redis.Redis.delete(cache, *stale)
+		approved = frappe.get_all("Tool", filters={"ingestion_status": "Approved"}, fields=FACET_FIELDS)
+		for start in range(0, len(approved), BATCH_SIZE):
+			batch = approved[start : start + BATCH_SIZE]
+			_apply(cache, {r.name: r for r in batch}, [r.name for r in batch])
+		redis.Redis.set(cache, key(BUILT_KEY), 1)
+	finally:
+		redis.Redis.delete(cache, key(REBUILD_LOCK_KEY))
+	return {"tools": len(approved)}
+
+
+def _ensure_built(cache) -> bool:
+	"""Whether the bitmaps can be read. When they are missing a single background
+	rebuild is queued and readers fall back to SQL until it finishes."""
+	key = cache.make_key
+	if redis.Redis.exists(cache, key(BUILT_KEY)):
+		return True
+	if redis.Redis.set(cache, key(REBUILD_LOCK_KEY), 1, nx=True, ex=300):
+		frappe.enqueue("ai_tools_dir.utils.facets.rebuild", queue="long")
+	return False
+
+
+def normalize_filters(form) -> dict:
+	"""Facet filters from request params, dropping anything not offered."""
+	tags = form.get("tag") or []
+	if isinstance(tags, str):
+		tags = tags.split(",")
+	pricing = form.get("pricing")
+	min_rating = cint(form.get("min_rating"))
+	return {
+		"pricing": pricing if pricing in PRICING else None,
+		"min_rating": min_rating if min_rating in MIN_RATINGS else None,
+		"tags": sorted({tag_slug(t) for t in tags if tag_slug(t)})[:MAX_TAG_FILTERS],
+	}
+
+
+def _filter_bitmaps(category: str | None, filters: dict, skip: str | None = None) -> list[str]:
+	keys = [_bits("all")]
+	if category and skip != "category":
+		keys.append(_bits("category", category))
+	if filters.get("pricing") and skip != "pricing":
+		keys.append(_bits("pricing", filters["pricing"]))
+	if filters.get("min_rating") and skip != "min_rating":
+		keys.append(_bits("rating", filters["min_rating"]))
+	keys += [_bits("tag", t) for t in filters.get("tags") or []]
+	return keys
+
+
+def facet_counts(category: str | None, filters: dict, categories: list[str]) -> dict | None:
+	"""Counts for every option of every facet, plus the filtered total, in one pipeline.
+
+	None while another worker is rebuilding the bitmaps.
+	"""
+	cache = frappe.cache()
+	key = cache.make_key
+	if not _ensure_built(cache):
+		return None
+	top_tags = [cstr(t) for t in redis.Redis.zrevrange(cache, key(TAG_COUNTS_KEY), 0, TOP_TAGS - 1)]
+	options = {
+		"category": [(c, _bits("category", c)) for c in categories],
+		"pricing": [(p, _bits("pricing", p)) for p in PRICING],
+		"min_rating": [(n, _bits("rating", n)) for n in MIN_RATINGS],
+		"tags": [(t, _bits("tag", t)) for t in dict.fromkeys([*filters.get("tags", []), *top_tags])],
+	}
+	tmp = f"{PREFIX}tmp:{uuid.uuid4().hex}"
+	temps = [key(f"{tmp}:total")]
+	pipe = cache.pipeline(transaction=False)
+	pipe.bitop("AND", temps[0], *map(key, _filter_bitmaps(category, filters)))
+	pipe.bitcount(temps[0])
+	order = []
+	for facet, values in options.items():
+		base = key(f"{tmp}:{facet}")
+		temps.append(base)
+		pipe.bitop("AND", base, *map(key, _filter_bitmaps(category, filters, skip=facet)))
+		for value, bitmap in values:
+			pipe.bitop("AND", key(f"{tmp}:opt"), base, key(bitmap))
+			pipe.bitcount(key(f"{tmp}:opt"))
+			order.append((facet, value))
+	temps.append(key(f"{tmp}:opt"))
+	pipe.delete(*temps)
+	results = pipe.execute()
+	# results: total bitop, total count, then per facet one bitop and (bitop, count) per option
+	counts = {facet: {} for facet in options}
+	it = iter(results[2:-1])
+	positions = iter(order)
+	for _facet, values in options.items():
+		next(it)
+		for _ in values:
+			next(it)
+			f, value = next(positions)
+			counts[f][value] = next(it)
+	return {"total": results[1], "counts": counts}
+
+
+def _bit_positions(data: bytes):
+	for i, byte in enumerate(data):
+		if byte:
+			for bit in range(8):
+				if byte & (0x80 >> bit):
+					yield i * 8 + bit
+
+
+def matching_names(category: str | None, filters: dict, limit: int = MAX_IN_NAMES) -> list[str] | None:
+	"""Names of approved tools matching the filters, or None when there are more than `limit`
+	(or the bitmaps are being rebuilt)."""
+	cache = frappe.cache()
+	key = cache.make_key
+	if not _ensure_built(cache):
+		return None
+	tmp = key(f"{PREFIX}tmp:{uuid.uuid4().hex}")
+	pipe = cache.pipeline(transaction=False)
+	pipe.bitop("AND", tmp, *map(key, _filter_bitmaps(category, filters)))
+	pipe.bitcount(tmp)
+	pipe.get(tmp)
+	pipe.delete(tmp)
+	_, count, data, _ = pipe.execute()
+	if count > limit:
+		return None
+	ids = list(_bit_positions(data or b""))
+	if not ids:
+		return []
+	return [cstr(n) for n in redis.Redis.hmget(cache, key(NAMES_KEY), ids) if n]
+
+
+def sql_conditions(filters: dict) -> tuple[list[str], dict]:
+	"""The same filters as SQL predicates over `tabTool`, for large result sets and search."""
+	conditions, params = [], {}
+	if filters.get("pricing"):
+		conditions.append("pricing = %(facet_pricing)s")
+		params["facet_pricing"] = filters["pricing"]
+	if filters.get("min_rating"):
+		conditions.append("average_rating >= %(facet_min_rating)s")
+		params["facet_min_rating"] = filters["min_rating"]
+	# the stored tag list reduced to the same slugs as tag_slug()
+	tag_slugs = (
+		"TRIM(BOTH '-' FROM REGEXP_REPLACE("
+		"REGEXP_REPLACE(LOWER(COALESCE(tags, '')), '[^a-z0-9,]+', '-'), '-*,-*', ','))"
+	)
+	for i, tag in enumerate(filters.get("tags") or []):
+		conditions.append(f"FIND_IN_SET(%(facet_tag{i})s, {tag_slugs}) > 0")
+		params[f"facet_tag{i}"] = tag
+	return conditions, params
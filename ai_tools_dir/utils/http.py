@@ -0,0 +1,34 @@
+"""Small helpers for whitelisted endpoints that need control over HTTP headers."""
+
+import frappe
+from werkzeug.wrappers import Response
+
+
+def _set_headers(response: Response, max_age: int, headers: dict | None) -> Response:
+	if max_age:
+		response.headers["Cache-Control"] = f"public, max-age={int(max_age)}"
+	else:
+		response.headers["Cache-Control"] = "no-cache"
+	for key, value in (headers or {}).items():
+		response.headers[key] = value
+	return response
+
+
+def json_response(data, max_age: int = 0, status: int = 200, headers: dict | None = None) -> Response:
+	"""JSON response in the usual {"message": ...} envelope with explicit cache headers."""
+	response = Response(
+		frappe.as_json({"message": data}, indent=None), status=status, mimetype="application/json"
+	)
+	return _set_headers(response, max_age, headers)
+
+
+def etag_matches(etag: str) -> bool:
+	"""Whether the request's If-None-Match already names the weak ETag `etag`."""
+	request = getattr(frappe.local, "request", None)
+	return bool(request and request.if_none_match.contains_weak(etag))
+
+
+def not_modified(etag: str, max_age: int = 0) -> Response:
+	response = Response(status=304)
+	response.set_etag(etag, weak=True)
+	return _set_headers(response, max_age, None)
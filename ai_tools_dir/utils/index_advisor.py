@@ -0,0 +1,298 @@
+"""Index advisor: EXPLAIN the queries the app actually issues and report full scans.
+
+Scenarios call the real code paths (homepage listing and search, tool page, upvote
+toggle, review hooks and the aggregate backfill) while every frappe.db.sql call is
+captured. Nothing is committed; the transaction is rolled back afterwards, and the
+Redis side effects the rollback cannot undo (generation bumps, the static journal,
+trending buffer, vote sets, facet bitmaps) are stubbed out for the run. Each captured
+SELECT/UPDATE/DELETE is then EXPLAINed and plans with full table scans, filesorts or
+temporary tables are flagged.
+
+To get before/after numbers on a realistic catalogue (test sites only):
+
+	bench --site test_site execute ai_tools_dir.utils.index_advisor.seed --kwargs '{"tools": 100000}'
+	bench --site test_site execute ai_tools_dir.utils.index_advisor.report
+	bench --site test_site migrate
+	bench --site test_site execute ai_tools_dir.utils.index_advisor.report
+"""
+
+import random
+import re
+from contextlib import contextmanager
+
+import frappe
+from frappe.utils import add_to_date, cint, now_datetime
+
+from ai_tools_dir.utils.reports import report_path
+from ai_tools_dir.utils.sql_trace import traced_sql
+
+SEED_SOURCE = "advisor-seed"
+_EXPLAINABLE = re.compile(r"^\s*(select|update|delete)\b", re.IGNORECASE)
+
+
+@contextmanager
+def _captured_queries():
+	"""Record every frappe.db.sql call; commits are suppressed so the run can be rolled back."""
+	captured: list[tuple[str, object]] = []
+	try:
+		with traced_sql(
+			on_sql=lambda query, values, ms: captured.append((query, values)), suppress_commit=True
+		):
+			yield captured
+	finally:
+		frappe.db.rollback()
+
+
+def _redis_side_effects() -> list[tuple[object, str]]:
+	"""(module, attribute) pairs the scenarios reach that write to Redis."""
+	from ai_tools_dir.api import vote
+	from ai_tools_dir.utils import facets, page_cache, static_journal, trending, votes
+
+	return [
+		(page_cache, "bump_tools"),
+		(page_cache, "bump_listing"),
+		(static_journal, "record"),
+		(trending, "record"),
+		(vote, "record_vote"),
+		(votes, "clear_vote_state"),
+		(facets, "update_tools"),
+	]
+
+
+@contextmanager
+def _without_redis_side_effects():
+	"""Replace Redis writers with no-ops, since db.rollback() cannot undo them."""
+	originals = [(module, attr, getattr(module, attr)) for module, attr in _redis_side_effects()]
+	for module, attr, _ in originals:
+		setattr(module, attr, lambda *a, **k: None)
+	try:
+		yield
+	finally:
+		for module, attr, fn in originals:
+			setattr(module, attr, fn)
+
+
+def _render_index(**form):
+	from ai_tools_dir.templates.pages import index
+
+	frappe.local.form_dict = frappe._dict(form)
+	index.get_context(frappe._dict())
+
+
+def _render_tool(slug: str):
+	from ai_tools_dir.www.tools import _slug
+
+	frappe.local.form_dict = frappe._dict(slug=slug)
+	_slug.get_context(frappe._dict())
+
+
+def _scenarios() -> list[tuple[str, callable]]:
+	from ai_tools_dir.api import vote
+	from ai_tools_dir.events import reviews
+
+	tool = frappe.db.get_value(
+		"Tool",
+		{"ingestion_status": "Approved"},
+		["name", "slug", "category"],
+		as_dict=True,
+		order_by="modified desc",
+	)
+	category_slug = tool and tool.category and frappe.db.get_value("Category", tool.category, "slug")
+	scenarios = [
+		("index: newest", lambda: _render_index()),
+		("index: top", lambda: _render_index(sort="ranking_score desc")),
+		("index: trending", lambda: _render_index(sort="trending_score desc")),
+		("index: top rated, page 3", lambda: _render_index(sort="average_rating desc", page=3)),
+		("index: search", lambda: _render_index(q="image generator")),
+		("reviews: hourly backfill", reviews.backfill_all_tool_aggregates),
+	]
+	if category_slug:
+		scenarios += [
+			("index: category", lambda: _render_index(category=category_slug)),
+			(
+				"index: category, top",
+				lambda: _render_index(category=category_slug, sort="ranking_score desc"),
+			),
+			(
+				"index: category, top rated",
+				lambda: _render_index(category=category_slug, sort="average_rating desc"),
+			),
+			(
+				"index: category, trending",
+				lambda: _render_index(category=category_slug, sort="trending_score desc"),
+			),
+		]
+	if tool:
+		scenarios += [
+			("tool page", lambda: _render_tool(tool.slug)),
+			("vote: toggle", lambda: vote.toggle_upvote(tool.slug)),
+			("reviews: insert delta", lambda: reviews._apply_delta(tool.name, 4, +1)),
+		]
+	return scenarios
+
+
+def _explain(query: str, values) -> list[dict]:
+	return frappe.db.sql(f"EXPLAIN {query}", values, as_dict=True)
+
+
+def _problems(plan_row: dict) -> list[str]:
+	problems = []
+	extra = plan_row.get("Extra") or ""
+	if plan_row.get("type") == "ALL":
+		problems.append("full table scan")
+	if "Using filesort" in extra:
+		problems.append("filesort")
+	if "Using temporary" in extra:
+		problems.append("temporary table")
+	return problems
+
+
+@frappe.whitelist()
+def report(output: str | None = None) -> dict:
+	"""Run the scenarios, EXPLAIN their queries and write a JSON report."""
+	frappe.only_for("System Manager")
+	output = report_path(output, "index-advisor")
+	results = []
+	for label, fn in _scenarios():
+		with _without_redis_side_effects(), _captured_queries() as captured:
+			try:
+				fn()
+			except Exception as e:
+				results.append({"scenario": label, "error": str(e)})
+				continue
+		seen = set()
+		for query, values in captured:
+			normalized = " ".join(query.split())
+			if not _EXPLAINABLE.match(normalized) or normalized in seen:
+				continue
+			seen.add(normalized)
+			try:
+				plan = _explain(query, values)
+			except Exception as e:
+				results.append({"scenario": label, "query": normalized[:500], "error": str(e)})
+				continue
+			for row in plan:
+				results.append(
+					{
+						"scenario": label,
+						"query": normalized[:500],
+						"table": row.get("table"),
+						"type": row.get("type"),
+						"key": row.get("key"),
+						"rows": row.get("rows"),
+						"extra": row.get("Extra"),
+						"problems": _problems(row),
+					}
+				)
+	summary = {
+		"site": frappe.local.site,
+		"generated_at": str(now_datetime()),
+		"tools": frappe.db.count("Tool"),
+		"plans": len(results),
+		"flagged": sum(1 for r in results if r.get("problems")),
+		"results": results,
+	}
+	with open(output, "w", encoding="utf-8") as f:
+		f.write(frappe.as_json(summary))
+	summary["output"] = output
+	return summary
+
+
+@frappe.whitelist()
+def seed(
+	tools: int = 100000, reviews_per_tool: float = 0.5, votes_per_tool: float = 0.5, force: bool = False
+) -> dict:
+	"""Bulk-insert a synthetic catalogue (tools, reviews, votes) on a test site."""
+	frappe.only_for("System Manager")
+	if not (frappe.conf.allow_tests or cint(force)):
+		frappe.throw("Seed the index advisor dataset on a test site (allow_tests) or pass force=1")
+	rng = random.Random(7)
+	tools = int(tools)
+	categories = frappe.get_all("Category", pluck="name") or [None]
+	user = frappe.session.user
+	now = now_datetime()
+	statuses = ["Approved"] * 7 + ["Pending Review"] * 2 + ["Rejected"]
+
+	tool_rows, names = [], []
+	for i in range(tools):
+		name = f"seed-{i}.example.ai"
+		names.append(name)
+		stamp = add_to_date(now, minutes=-rng.randint(0, 525600))
+		tool_rows.append(
+			(
+				name,
+				name,
+				f"Seed Tool {i}",
+				f"Seeded tool {i} for index advisor runs.",
+				f"https://{name}/",
+				rng.choice(categories),
+				rng.choice(["Free", "Freemium", "Paid", ""]),
+				SEED_SOURCE,
+				rng.choice(statuses),
+				round(rng.uniform(0, 5), 2),
+				rng.randint(0, 500),
+				rng.randint(0, 5000),
+				round(rng.uniform(0, 10), 6),
+				user,
+				user,
+				stamp,
+				stamp,
+			)
+		)
+	frappe.db.bulk_insert(
+		"Tool",
+		fields=[
+			"name",
+			"slug",
+			"tool_name",
+			"description",
+			"website",
+			"category",
+			"pricing",
+			"source",
+			"ingestion_status",
+			"average_rating",
+			"upvote_count",
+			"click_count",
+			"ranking_score",
+			"owner",
+			"modified_by",
+			"creation",
+			"modified",
+		],
+		values=tool_rows,
+		ignore_duplicates=True,
+	)
+
+	review_rows = [
+		(f"RV-SEED-{i}", rng.choice(names), user, rng.randint(1, 5), "Seeded review", user, user, now, now)
+		for i in range(int(tools * float(reviews_per_tool)))
+	]
+	frappe.db.bulk_insert(
+		"Review",
+		fields=["name", "tool", "user", "rating", "comment", "owner", "modified_by", "creation", "modified"],
+		values=review_rows,
+		ignore_duplicates=True,
+	)
+	vote_rows = [
+		(f"TV-SEED-{i}", rng.choice(names), user, user, user, now, now)
+		for i in range(int(tools * float(votes_per_tool)))
+	]
+	frappe.db.bulk_insert(
+		"Tool Vote",
+		fields=["name", "tool", "user", "owner", "modified_by", "creation", "modified"],
+		values=vote_rows,
+		ignore_duplicates=True,
+	)
+	frappe.db.commit()
+	return {"tools": len(tool_rows), "reviews": len(review_rows), "votes": len(vote_rows)}
+
+
+@frappe.whitelist()
+def clear_seed() -> dict:
+	frappe.only_for("System Manager")
+	frappe.db.delete("Review", {"name": ["like", "RV-SEED-%"]})
+	frappe.db.delete("Tool Vote", {"name": ["like", "TV-SEED-%"]})
+	frappe.db.delete("Tool", {"source": SEED_SOURCE})
+	frappe.db.commit()
+	return {"ok": True}
@@ -0,0 +1,87 @@
+"""Approved-tool listings with keyset pagination over an allow-list of sorts.
+
+Every allowed sort is `<indexed column> desc, name desc`, so a page is an index range
+read from the previous page's last (value, name) pair instead of an OFFSET that reads
+and discards every earlier row. The first NUMBERED_PAGES pages may still be addressed
+by number (a bounded OFFSET) so the pager can show page links.
+"""
+
+import frappe
+from frappe.utils import cint
+
+from ai_tools_dir.utils.pagination import decode_cursor, encode_cursor
+
+# value shown in the sort <select> -> column; all ordered desc with name desc as tie-breaker
+SORTS = {
+	"modified desc": "modified",
+	"ranking_score desc": "ranking_score",
+	"trending_score desc": "trending_score",
+	"average_rating desc": "average_rating",
+}
+DEFAULT_SORT = "modified desc"
+PAGE_SIZE = 24
+NUMBERED_PAGES = 5
+
+LISTING_FIELDS = [
+	"name",
+	"tool_name",
+	"slug",
+	"pricing",
+	"logo",
+	"average_rating",
+	"upvote_count",
+]
+
+
+def normalize_sort(sort: str | None) -> str:
+	sort = " ".join((sort or "").lower().split())
+	return sort if sort in SORTS else DEFAULT_SORT
+
+
+def clamp_page(page) -> int:
+	return min(max(cint(page) or 1, 1), NUMBERED_PAGES)
+
+
+def fetch_page(
+	conditions: list[str],
+	params: dict,
+	sort: str = DEFAULT_SORT,
+	cursor: str | None = None,
+	page: int = 1,
+	page_size: int = PAGE_SIZE,
+	fields: list[str] | None = None,
+) -> tuple[list[dict], str | None]:
+	"""One page of approved tools matching `conditions` plus the cursor for the next page.
+
+	`conditions` are SQL fragments over `tabTool` combined with AND; `params` holds their
+	named parameters. A valid cursor takes precedence over `page`.
+	"""
+	column = SORTS[normalize_sort(sort)]
+	fields = fields or LISTING_FIELDS
+	where = ["ingestion_status = 'Approved'", *conditions]
+	params = {**params, "limit": page_size + 1, "offset": 0}
+	last = decode_cursor(cursor, 2)
+	if last:
+		where.append(
+			f"(`{column}` < %(cursor_value)s OR (`{column}` = %(cursor_value)s AND name < %(cursor_name)s))"
+		)
+		params.update(cursor_value=last[0], cursor_name=last[1])
+	else:
+		params["offset"] = (clamp_page(page) - 1) * page_size
+	select = ", ".join(f"`{f}`" for f in dict.fromkeys([*fields, column, "name"]))
+	rows = frappe.db.sql(
+		f"""
+		SELECT {select}
+		FROM `tabTool`
+		WHERE {" AND ".join(where)}
+		ORDER BY `{column}` DESC, name DESC
+		LIMIT %(offset)s, %(limit)s
+		""",
+		params,
+		as_dict=True,
+	)
+	next_cursor = None
+	if len(rows) > page_size:
+		rows = rows[:page_size]
+		next_cursor = encode_cursor(rows[-1][column], rows[-1].name)
+	return rows, next_cursor
@@ -0,0 +1,211 @@
+"""Rendered-HTML cache for anonymous requests to the directory pages.
+
+Registered through the `page_renderer` hook, CachedTemplatePage serves `/`,
+`/categories/<slug>` and `/tools/<slug>` to guests from Redis, keyed by route and
+normalized query parameters. Keys embed generation counters, so invalidation is a
+single INCR:
+
+- the listing generation covers the homepage and category pages, and is bumped by
+  any Tool, Category, Review or Tool Vote change;
+- each tool page has its own generation, bumped only by events for that tool. Tool
+  generations are keyed by document name; the route carries the slug, so the
+  slug -> name lookup is cached briefly in Redis and dropped whenever the tool changes.
+
+Bumps are collected per transaction and applied after it commits, so a page rendered
+from pre-commit rows is never stored under the new generation.
+
+Concurrent misses for the same key are coalesced: one request renders while the
+others wait briefly for its result.
+"""
+
+import time
+from urllib.parse import urlencode
+
+import frappe
+import redis
+from frappe.utils import cstr
+from frappe.website.page_renderers.template_page import TemplatePage
+
+from ai_tools_dir.utils import profiler, static_journal
+
+LISTING_ENDPOINTS = {"index", "categories/_slug"}
+TOOL_ENDPOINTS = {"tools/_slug"}
+# Query params that change page content; anything else (utm_*, fbclid...) is ignored
+VARY_PARAMS = ("q", "sort", "category", "pricing", "min_rating", "tag", "page", "cursor", "slug")
+PAGE_TTL = 24 * 3600
+LOCK_TTL = 15
+WAIT_FOR_RENDER = 2.0
+STATS_KEY = "ai_tools_dir:page_cache:stats"
+SLUG_KEY = "ai_tools_dir:page_cache:slug:"
+SLUG_TTL = 300
+
+
+def _gen_key(scope: str) -> str:
+	return f"ai_tools_dir:page_cache:gen:{scope}"
+
+
+def _generation(cache, scope: str) -> int:
+	return int(redis.Redis.get(cache, cache.make_key(_gen_key(scope))) or 0)
+
+
+def generation(scope: str) -> int:
+	"""Current generation of "listing" or "tool:<name>"; bumped on every change that
+	affects the pages in that scope, so it doubles as a version for ETags."""
+	return _generation(frappe.cache(), scope)
+
+
+def tool_name(slug: str) -> str | None:
+	"""Name of the Tool at /tools/<slug>, served from Redis on the hot path."""
+	if not slug:
+		return None
+	cache = frappe.cache()
+	key = cache.make_key(SLUG_KEY + slug)
+	cached = redis.Redis.get(cache, key)
+	if cached is not None:
+		return cstr(cached) or None
+	name = frappe.db.get_value("Tool", {"slug": slug}, "name")
+	# misses are cached too; creating the tool drops the entry through bump_tools
+	redis.Redis.set(cache, key, name or "", ex=SLUG_TTL)
+	return name
+
+
+def _pending() -> dict:
+	"""Bumps collected for the current transaction, flushed once it commits.
+
+	Bumping before the commit would let a guest render the old rows and cache them
+	under the new generation, so the bump would pin the stale page instead.
+	"""
+	pending = getattr(frappe.local, "ai_tools_page_cache_bumps", None)
+	if pending is None:
+		pending = frappe.local.ai_tools_page_cache_bumps = {
+			"tools": set(),
+			"journal": set(),
+			"listing": False,
+		}
+		frappe.db.after_commit.add(_flush)
+		frappe.db.after_rollback.add(_discard)
+	return pending
+
+
+def _discard() -> None:
+	frappe.local.ai_tools_page_cache_bumps = None
+
+
+def _flush() -> None:
+	pending = getattr(frappe.local, "ai_tools_page_cache_bumps", None)
+	frappe.local.ai_tools_page_cache_bumps = None
+	if not pending:
+		return
+	cache = frappe.cache()
+	names = pending["tools"]
+	# current slugs of the tools; a renamed tool keeps its slug, so this also drops
+	# mappings that still point at the old name
+	slugs = frappe.get_all("Tool", filters={"name": ["in", list(names)]}, pluck="slug") if names else []
+	pipe = cache.pipeline(transaction=False)
+	for name in names:
+		pipe.incr(cache.make_key(_gen_key(f"tool:{name}")))
+	for slug in filter(None, slugs):
+		pipe.delete(cache.make_key(SLUG_KEY + slug))
+	pipe.incr(cache.make_key(_gen_key("listing")))
+	pipe.execute()
+	static_journal.record(tools=pending["journal"], listing=True)
+
+
+def bump_listing() -> None:
+	"""Invalidate every listing page once the current transaction commits."""
+	_pending()["listing"] = True
+
+
+def bump_tools(names: list[str], journal_tools: bool = True) -> None:
+	"""Invalidate the tool pages of `names` plus every listing page, once the current
+	transaction commits.
+
+	`journal_tools=False` leaves the static tool pages alone, for changes (like the
+	trending score) that only the cached pages and the JSON API show.
+	"""
+	names = {n for n in names if n}
+	pending = _pending()
+	pending["tools"] |= names
+	if journal_tools:
+		pending["journal"] |= names
+	pending["listing"] = True
+
+
+def _record(endpoint: str, outcome: str) -> None:
+	cache = frappe.cache()
+	redis.Redis.hincrby(cache, cache.make_key(STATS_KEY), f"{endpoint}:{outcome}", 1)
+
+
+class CachedTemplatePage(TemplatePage):
+	def can_render(self):
+		return (
+			self.path in LISTING_ENDPOINTS | TOOL_ENDPOINTS
+			and frappe.session.user == "Guest"
+			and getattr(frappe.local, "request", None) is not None
+			and frappe.request.method in ("GET", "HEAD")
+			and super().can_render()
+		)
+
+	def _cache_key(self, cache) -> str:
+		form = frappe.local.form_dict
+		params = sorted((k, str(form.get(k))) for k in VARY_PARAMS if form.get(k) not in (None, ""))
+		if self.path in TOOL_ENDPOINTS:
+			gen = _generation(cache, f"tool:{tool_name(form.get('slug'))}")
+		else:
+			gen = _generation(cache, "listing")
+		return f"ai_tools_dir:page_cache:page:{self.path}:{gen}:{frappe.local.lang}:{urlencode(params)}"
+
+	def render(self):
+		cache = frappe.cache()
+		key = cache.make_key(self._cache_key(cache))
+		html = redis.Redis.get(cache, key)
+		outcome = "hit"
+		if html is None:
+			html, outcome = self._render_coalesced(cache, key)
+		_record(self.path, outcome)
+		profiler.note_cache("page", outcome == "hit")
+		html = html.decode() if isinstance(html, bytes) else html
+		return self.build_response(html, headers={"X-Page-Cache": outcome.upper()})
+
+	def _render_coalesced(self, cache, key: str) -> tuple[str, str]:
+		lock = f"{key}:lock"
+		if not redis.Redis.set(cache, lock, 1, nx=True, ex=LOCK_TTL):
+			deadline = time.monotonic() + WAIT_FOR_RENDER
+			while time.monotonic() < deadline:
+				time.sleep(0.05)
+				html = redis.Redis.get(cache, key)
+				if html is not None:
+					return html, "coalesced"
+		try:
+			start = time.perf_counter()
+			html = self.get_html()
+			profiler.note_render((time.perf_counter() - start) * 1000)
+			if (getattr(self, "context", None) or {}).get("http_status_code", 200) == 200:
+				redis.Redis.set(cache, key, html, ex=PAGE_TTL)
+		finally:
+			redis.Redis.delete(cache, lock)
+		return html, "miss"
+
+
+def on_review_change(doc, method=None):
+	bump_tools([doc.tool])
+
+
+def on_vote_change(doc, method=None):
+	bump_tools([doc.tool])
+
+
+@frappe.whitelist()
+def stats() -> dict:
+	"""Hit/miss counters and hit ratio per cached endpoint."""
+	frappe.only_for("System Manager")
+	cache = frappe.cache()
+	raw = redis.Redis.hgetall(cache, cache.make_key(STATS_KEY))
+	out = {}
+	for field, value in raw.items():
+		endpoint, outcome = frappe.safe_decode(field).rsplit(":", 1)
+		out.setdefault(endpoint, {"hit": 0, "miss": 0, "coalesced": 0})[outcome] = int(value)
+	for counts in out.values():
+		total = sum(counts.values())
+		counts["hit_ratio"] = round((counts["hit"] + counts["coalesced"]) / total, 4) if total else None
+	return out
@@ -0,0 +1,30 @@
+"""Opaque cursors for keyset pagination.
+
+A cursor carries the sort-key values of the last row on a page (plus `name` as the
+tie-breaker), so the next page is `WHERE (key, name) < (last_key, last_name)` on an
+index instead of an OFFSET scan.
+"""
+
+import base64
+import json
+
+from frappe.utils import cstr
+
+
+def encode_cursor(*values) -> str:
+	raw = json.dumps([cstr(v) if v is not None else None for v in values], separators=(",", ":"))
+	return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None, size: int) -> list | None:
+	"""Return the `size` values encoded in `cursor`, or None for a missing/invalid cursor."""
+	if not cursor:
+		return None
+	try:
+		padded = cursor + "=" * (-len(cursor) % 4)
+		values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+	except Exception:
+		return None
+	if not isinstance(values, list) or len(values) != size:
+		return None
+	return values
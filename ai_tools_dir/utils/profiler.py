@@ -0,0 +1,233 @@
+"""Opt-in per-request SQL profiling for website pages and API endpoints.
+
+Enabled for every request by `"ai_tools_profile": 1` in site_config.json, or for a
+single request by a System Manager sending the `X-AI-Tools-Profile: 1` header. When
+active, every frappe.db.sql call is timed and attributed to the first ai_tools_dir
+frame that issued it; page renders and cache hits/misses are noted too. Each request
+is folded into a rolling per-endpoint sample in Redis (see `summary`) and the most
+recent profiles are kept in full (see `recent`). Endpoints are normalised (method
+names, slug routes) and at most MAX_ENDPOINTS distinct ones are tracked; the rest are
+pooled under OTHER_ENDPOINT, and every key expires after PROFILE_TTL without traffic.
+
+When profiling is off the hooks cost one config lookup and one header lookup.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from contextlib import ExitStack
+
+import frappe
+import redis
+
+from ai_tools_dir.utils import sql_trace
+
+HEADER = "X-AI-Tools-Profile"
+SAMPLES_PER_ENDPOINT = 500
+RECENT_PROFILES = 50
+MAX_STATEMENTS = 200
+MAX_ENDPOINTS = 200
+OTHER_ENDPOINT = "<other>"
+PROFILE_TTL = 7 * 24 * 3600
+SAMPLES_KEY = "ai_tools_dir:profile:samples:"
+COUNTS_KEY = "ai_tools_dir:profile:counts"
+RECENT_KEY = "ai_tools_dir:profile:recent"
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SKIP_FILES = {os.path.abspath(__file__), os.path.abspath(sql_trace.__file__)}
+_METHOD = re.compile(r"^[\w.]+$")
+_ROUTES = [
+	(re.compile(r"^/(tools?)/[^/]+/?$"), r"/\1/<slug>"),
+	(re.compile(r"^/categories/[^/]+/?$"), "/categories/<slug>"),
+	(re.compile(r"^/api/resource/([^/]+)/.+$"), r"/api/resource/\1/<name>"),
+]
+
+
+def _active() -> dict | None:
+	return getattr(frappe.local, "ai_tools_profile", None)
+
+
+def _requested() -> bool:
+	if frappe.conf.get("ai_tools_profile"):
+		return True
+	request = getattr(frappe.local, "request", None)
+	if request is None or request.headers.get(HEADER) != "1":
+		return False
+	return "System Manager" in frappe.get_roles()
+
+
+def _call_site() -> str | None:
+	frame = sys._getframe(1)
+	while frame:
+		filename = os.path.abspath(frame.f_code.co_filename)
+		if filename.startswith(_APP_DIR) and filename not in _SKIP_FILES:
+			return f"{os.path.relpath(filename, _APP_DIR)}:{frame.f_lineno} ({frame.f_code.co_name})"
+		frame = frame.f_back
+	return None
+
+
+def _endpoint() -> str:
+	request = frappe.local.request
+	path = request.path
+	if path.startswith("/api/method/"):
+		method = path[len("/api/method/") :]
+		return method if _METHOD.match(method) else OTHER_ENDPOINT
+	for pattern, replacement in _ROUTES:
+		if pattern.match(path):
+			return pattern.sub(replacement, path)
+	return path.rstrip("/") or "/"
+
+
+def _tracked(cache, endpoint: str) -> str:
+	"""`endpoint`, or OTHER_ENDPOINT once MAX_ENDPOINTS others are already tracked."""
+	counts_key = cache.make_key(COUNTS_KEY)
+	if (
+		redis.Redis.hexists(cache, counts_key, endpoint)
+		or redis.Redis.hlen(cache, counts_key) < MAX_ENDPOINTS
+	):
+		return endpoint
+	return OTHER_ENDPOINT
+
+
+def before_request():
+	if not _requested():
+		return
+	profile = {
+		"start": time.perf_counter(),
+		"statements": [],
+		"queries": 0,
+		"sql_ms": 0.0,
+		"cache": {},
+		"render_ms": None,
+	}
+
+	def on_sql(query, values, ms):
+		profile["sql_ms"] += ms
+		profile["queries"] += 1
+		if len(profile["statements"]) < MAX_STATEMENTS:
+			profile["statements"].append(
+				{
+					"sql": " ".join(query.split())[:300],
+					"ms": round(ms, 3),
+					"site": _call_site(),
+				}
+			)
+
+	# entered here, closed in after_request
+	profile["trace"] = ExitStack()
+	profile["trace"].enter_context(sql_trace.traced_sql(on_sql=on_sql))
+	frappe.local.ai_tools_profile = profile
+
+
+def note_cache(name: str, hit: bool) -> None:
+	"""Record a cache lookup outcome for the current profiled request, if any."""
+	profile = _active()
+	if profile is not None:
+		counts = profile["cache"].setdefault(name, {"hit": 0, "miss": 0})
+		counts["hit" if hit else "miss"] += 1
+
+
+def note_render(ms: float) -> None:
+	profile = _active()
+	if profile is not None:
+		profile["render_ms"] = round((profile["render_ms"] or 0) + ms, 3)
+
+
+def after_request(response=None, request=None):
+	profile = _active()
+	if profile is None:
+		return
+	frappe.local.ai_tools_profile = None
+	profile.pop("trace").close()
+	total_ms = (time.perf_counter() - profile.pop("start")) * 1000
+	endpoint = _endpoint()
+	queries = profile["queries"]
+	if response is not None:
+		response.headers["Server-Timing"] = f"db;dur={profile['sql_ms']:.1f}, total;dur={total_ms:.1f}"
+		response.headers["X-AI-Tools-Queries"] = str(queries)
+	try:
+		sample = json.dumps({"ms": round(total_ms, 3), "q": queries, "sql_ms": round(profile["sql_ms"], 3)})
+		full = frappe.as_json(
+			{
+				"endpoint": endpoint,
+				"method": frappe.local.request.method,
+				"status": getattr(response, "status_code", None),
+				"total_ms": round(total_ms, 3),
+				"sql_ms": round(profile["sql_ms"], 3),
+				"render_ms": profile["render_ms"],
+				"queries": queries,
+				"cache": profile["cache"],
+				"statements": profile["statements"],
+			},
+			indent=None,
+		)
+		cache = frappe.cache()
+		tracked = _tracked(cache, endpoint)
+		pipe = cache.pipeline(transaction=False)
+		samples_key = cache.make_key(SAMPLES_KEY + tracked)
+		pipe.lpush(samples_key, sample)
+		pipe.ltrim(samples_key, 0, SAMPLES_PER_ENDPOINT - 1)
+		pipe.expire(samples_key, PROFILE_TTL)
+		pipe.hincrby(cache.make_key(COUNTS_KEY), tracked, 1)
+		pipe.expire(cache.make_key(COUNTS_KEY), PROFILE_TTL)
+		pipe.lpush(cache.make_key(RECENT_KEY), full)
+		pipe.ltrim(cache.make_key(RECENT_KEY), 0, RECENT_PROFILES - 1)
+		pipe.expire(cache.make_key(RECENT_KEY), PROFILE_TTL)
+		pipe.execute()
+	except Exception:
+		frappe.logger("ai_tools_dir").exception("failed to store request profile")
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+	if not values:
+		return None
+	values = sorted(values)
+	return values[min(round(pct * (len(values) - 1)), len(values) - 1)]
+
+
+@frappe.whitelist()
+def summary() -> dict:
+	"""Per-endpoint request count and p50/p95 timings over the rolling sample window."""
+	frappe.only_for("System Manager")
+	cache = frappe.cache()
+	counts = redis.Redis.hgetall(cache, cache.make_key(COUNTS_KEY))
+	out = {}
+	for raw_endpoint, count in counts.items():
+		endpoint = frappe.safe_decode(raw_endpoint)
+		samples = [
+			json.loads(s) for s in redis.Redis.lrange(cache, cache.make_key(SAMPLES_KEY + endpoint), 0, -1)
+		]
+		times = [s["ms"] for s in samples]
+		queries = [s["q"] for s in samples]
+		out[endpoint] = {
+			"count": int(count),
+			"window": len(samples),
+			"p50_ms": _percentile(times, 0.5),
+			"p95_ms": _percentile(times, 0.95),
+			"p50_sql_ms": _percentile([s["sql_ms"] for s in samples], 0.5),
+			"queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+			"max_queries": max(queries) if queries else None,
+		}
+	return out
+
+
+@frappe.whitelist()
+def recent(endpoint: str | None = None, limit: int = 20) -> list[dict]:
+	"""Most recent full request profiles (statements with timings and call sites)."""
+	frappe.only_for("System Manager")
+	cache = frappe.cache()
+	profiles = [json.loads(p) for p in redis.Redis.lrange(cache, cache.make_key(RECENT_KEY), 0, -1)]
+	if endpoint:
+		profiles = [p for p in profiles if p["endpoint"] == endpoint]
+	return profiles[: int(limit)]
+
+
+@frappe.whitelist()
+def reset() -> dict:
+	frappe.only_for("System Manager")
+	cache = frappe.cache()
+	keys = [cache.make_key(COUNTS_KEY), cache.make_key(RECENT_KEY)]
+	keys += list(redis.Redis.scan_iter(cache, match=cache.make_key(SAMPLES_KEY) + "*"))
+	redis.Redis.delete(cache, *keys)
+	return {"ok": True}
@@ -0,0 +1,75 @@
+"""Materialized "top" ranking score for Tools.
+
+score = Bayesian average rating + engagement, where the Bayesian average pulls tools
+with few reviews towards the catalogue-wide mean:
+
+	bayes = (PRIOR_WEIGHT * mean + rating_sum) / (PRIOR_WEIGHT + rated_reviews)
+	score = bayes + UPVOTE_WEIGHT * ln(1 + upvotes) + CLICK_WEIGHT * ln(1 + clicks)
+
+The score is stored in Tool.ranking_score (indexed with ingestion_status) so the "top"
+sort is an index range read instead of an expression evaluated per row.
+"""
+
+import frappe
+
+from ai_tools_dir.utils.page_cache import bump_listing
+
+PRIOR_WEIGHT = 10
+UPVOTE_WEIGHT = 0.5
+CLICK_WEIGHT = 0.1
+DEFAULT_MEAN = 3.0
+MEAN_CACHE_KEY = "ai_tools_dir:ranking:global_mean"
+
+_RATED = "(rating_1 + rating_2 + rating_3 + rating_4 + rating_5)"
+SCORE_SQL = f"""ROUND(
+	(%(prior)s * %(mean)s + COALESCE(rating_sum, 0)) / (%(prior)s + {_RATED})
+	+ %(upvote_w)s * LN(1 + GREATEST(COALESCE(upvote_count, 0), 0))
+	+ %(click_w)s * LN(1 + GREATEST(COALESCE(click_count, 0), 0)),
+	6)"""
+
+
+def global_mean(refresh: bool = False) -> float:
+	"""Mean rating over all rated reviews, cached for an hour."""
+	cache = frappe.cache()
+	if not refresh:
+		cached = cache.get_value(MEAN_CACHE_KEY)
+		if cached is not None:
+			return float(cached)
+	mean = frappe.db.sql(f"SELECT SUM(rating_sum) / NULLIF(SUM({_RATED}), 0) FROM `tabTool`")[0][0]
+	mean = float(mean) if mean is not None else DEFAULT_MEAN
+	cache.set_value(MEAN_CACHE_KEY, mean, expires_in_sec=3600)
+	return mean
+
+
+def _params(mean: float | None = None) -> dict:
+	return {
+		"prior": PRIOR_WEIGHT,
+		"mean": global_mean() if mean is None else mean,
+		"upvote_w": UPVOTE_WEIGHT,
+		"click_w": CLICK_WEIGHT,
+	}
+
+
+def refresh_scores(names: list[str]) -> None:
+	"""Recompute ranking_score for the given tools (review, vote and click paths)."""
+	names = [n for n in names if n]
+	if not names:
+		return
+	frappe.db.sql(
+		f"UPDATE `tabTool` SET ranking_score = {SCORE_SQL} WHERE name IN %(names)s",
+		{**_params(), "names": tuple(names)},
+	)
+
+
+def recompute_all_scores() -> dict:
+	"""Periodic job: refresh the global mean and rewrite scores that drifted from it."""
+	frappe.db.sql(
+		f"UPDATE `tabTool` SET ranking_score = {SCORE_SQL} WHERE ranking_score != {SCORE_SQL}",
+		_params(global_mean(refresh=True)),
+	)
+	changed = frappe.db.sql("SELECT ROW_COUNT()")[0][0]
+	if changed:
+		# the "Top" orderings moved
+		bump_listing()
+	frappe.db.commit()
+	return {"changed": changed}
@@ -0,0 +1,22 @@
+"""Where benchmark and advisor reports are written."""
+
+import os
+import re
+
+import frappe
+from frappe.utils import now_datetime
+
+_SAFE_NAME = re.compile(r"^[\w.-]+\.json$")
+
+
+def report_path(output: str | None, prefix: str) -> str:
+	"""Path for a JSON report under <site>/private/benchmarks.
+
+	`output` may only name a file there, never a path elsewhere on the server.
+	"""
+	name = output or f"{prefix}-{now_datetime().strftime('%Y%m%d-%H%M%S')}.json"
+	if not _SAFE_NAME.match(name) or name.startswith("."):
+		frappe.throw(f"Invalid report file name: {name}. Use a plain name ending in .json.")
+	directory = frappe.get_site_path("private", "benchmarks")
+	os.makedirs(directory, exist_ok=True)
+	return os.path.join(directory, name)
@@ -0,0 +1,92 @@
+"""Full-text search over approved Tools.
+
+Backed by InnoDB FULLTEXT indexes on (tool_name, description, search_keywords) and on
+tool_name alone. `search_keywords` is a denormalized column holding the category and
+tags, kept current by Tool.validate and by refresh_search_keywords for bulk writes,
+so one MATCH covers name, description, tags and category.
+"""
+
+import re
+
+import frappe
+from frappe.utils import cstr
+
+from ai_tools_dir.utils.counts import capped_count
+
+# InnoDB ignores shorter tokens (innodb_ft_min_token_size)
+MIN_TOKEN_LEN = 3
+MAX_TOKENS = 8
+NAME_BOOST = 2
+_TOKEN = re.compile(r"[\w]+", re.UNICODE)
+_MATCH_ALL = "MATCH(tool_name, description, search_keywords) AGAINST (%(ft_query)s IN BOOLEAN MODE)"
+_MATCH_NAME = "MATCH(tool_name) AGAINST (%(ft_query)s IN BOOLEAN MODE)"
+
+
+def build_search_keywords(category: str | None, category_slug: str | None, tags: str | None) -> str:
+	parts = [cstr(category), cstr(category_slug).replace("-", " ").replace("_", " ")]
+	parts += [t.strip() for t in cstr(tags).split(",") if t.strip()]
+	return " ".join(p for p in dict.fromkeys(parts) if p)
+
+
+def refresh_search_keywords(names: list[str], batch_size: int = 1000) -> None:
+	"""Recompute search_keywords for many tools, one UPDATE per batch."""
+	names = [n for n in names if n]
+	for i in range(0, len(names), batch_size):
+		frappe.db.sql(
+			"""
+			UPDATE `tabTool` t
+			LEFT JOIN `tabCategory` c ON c.name = t.category
+			SET t.search_keywords = TRIM(CONCAT_WS(' ',
+				c.name,
+				REPLACE(REPLACE(c.slug, '-', ' '), '_', ' '),
+				REPLACE(COALESCE(t.tags, ''), ',', ' ')))
+			WHERE t.name IN %(names)s
+			""",
+			{"names": tuple(names[i : i + batch_size])},
+		)
+
+
+def boolean_query(q: str) -> str:
+	"""Turn user input into a BOOLEAN MODE query: every term required, prefix-matched."""
+	tokens = [t for t in _TOKEN.findall(cstr(q).lower()) if len(t) >= MIN_TOKEN_LEN]
+	return " ".join(f"+{t}*" for t in tokens[:MAX_TOKENS])
+
+
+def search_condition(q: str) -> tuple[str, str, dict]:
+	"""Return (WHERE fragment, relevance expression, params) for `q` against `tabTool`.
+
+	Queries made only of very short tokens fall back to a name prefix match.
+	"""
+	ft_query = boolean_query(q)
+	if not ft_query:
+		prefix = cstr(q).strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+		return "tool_name LIKE %(name_prefix)s", "0", {"name_prefix": f"{prefix}%"}
+	return _MATCH_ALL, f"({_MATCH_ALL} + {NAME_BOOST} * {_MATCH_NAME})", {"ft_query": ft_query}
+
+
+def search_tools(
+	q: str,
+	fields: list[str],
+	filters_sql: str = "",
+	params: dict | None = None,
+	start: int = 0,
+	limit: int = 24,
+) -> tuple[list[dict], int, bool]:
+	"""Approved tools matching `q`, most relevant first, plus the match count capped at
+	SEARCH_COUNT_CAP and whether the cap was hit."""
+	where, score, search_params = search_condition(q)
+	params = {**(params or {}), **search_params, "start": int(start), "limit": int(limit)}
+	conditions = f"ingestion_status = 'Approved' AND {where} {filters_sql}"
+	tools = frappe.db.sql(
+		f"""
+		SELECT {", ".join(f"`{f}`" for f in fields)}, {score} AS relevance
+		FROM `tabTool`
+		WHERE {conditions}
+		ORDER BY relevance DESC, name ASC
+		LIMIT %(start)s, %(limit)s
+		""",
+		params,
+		as_dict=True,
+	)
+	total, capped = capped_count(conditions, params)
+	return tools, total, capped
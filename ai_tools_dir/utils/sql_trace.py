@@ -0,0 +1,50 @@
+"""Temporary instrumentation of frappe.db.sql and frappe.db.commit.
+
+The import benchmark, the index advisor and the request profiler all observe the
+statements a code path issues; they share this one wrapper so frappe.db is patched
+the same way everywhere and always restored.
+"""
+
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+
+import frappe
+
+
+@contextmanager
+def traced_sql(
+	on_sql: Callable[[str, object, float], None] | None = None,
+	on_commit: Callable[[float], None] | None = None,
+	suppress_commit: bool = False,
+):
+	"""Call `on_sql(query, values, ms)` after every frappe.db.sql and `on_commit(ms)`
+	after every commit. With `suppress_commit` commits are dropped, so the caller can
+	roll the whole run back."""
+	db = frappe.db
+	orig_sql, orig_commit = db.sql, db.commit
+
+	def sql(query, *args, **kwargs):
+		start = time.perf_counter()
+		try:
+			return orig_sql(query, *args, **kwargs)
+		finally:
+			if on_sql is not None:
+				values = args[0] if args else kwargs.get("values", ())
+				on_sql(str(query), values, (time.perf_counter() - start) * 1000)
+
+	def commit(*args, **kwargs):
+		if suppress_commit:
+			return
+		start = time.perf_counter()
+		try:
+			return orig_commit(*args, **kwargs)
+		finally:
+			if on_commit is not None:
+				on_commit((time.perf_counter() - start) * 1000)
+
+	db.sql, db.commit = sql, commit
+	try:
+		yield
+	finally:
+		db.sql, db.commit = orig_sql, orig_commit
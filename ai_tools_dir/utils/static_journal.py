@@ -0,0 +1,47 @@
+"""Change journal for the static export (etl.static_export).
+
+Changes that alter anonymous pages are recorded as members of one Redis set:
+"tool:<name>", "category:<name>" and "listing". The set dedupes repeated changes, so
+it never holds more than one entry per tool and category. The exporter claims the
+set atomically, rebuilds just those pages and puts the entries back if it fails.
+"""
+
+import frappe
+import redis
+
+JOURNAL_KEY = "ai_tools_dir:static_export:journal"
+CLAIMED_KEY = "ai_tools_dir:static_export:journal:claimed"
+LISTING = "listing"
+
+
+def record(tools=(), categories=(), listing: bool = False) -> None:
+	entries = [f"tool:{n}" for n in tools if n] + [f"category:{c}" for c in categories if c]
+	if listing:
+		entries.append(LISTING)
+	if not entries:
+		return
+	cache = frappe.cache()
+	try:
+		redis.Redis.sadd(cache, cache.make_key(JOURNAL_KEY), *entries)
+	except redis.exceptions.RedisError:
+		frappe.logger("ai_tools_dir").exception("failed to journal static export changes")
+
+
+def claim() -> set[str]:
+	"""Take every pending entry (plus any left by a failed run)."""
+	cache = frappe.cache()
+	claimed = cache.make_key(CLAIMED_KEY)
+	pipe = cache.pipeline(transaction=True)
+	pipe.sunionstore(claimed, [claimed, cache.make_key(JOURNAL_KEY)])
+	pipe.delete(cache.make_key(JOURNAL_KEY))
+	pipe.execute()
+	return {frappe.safe_decode(m) for m in redis.Redis.smembers(cache, claimed)}
+
+
+def release(done: bool) -> None:
+	"""Drop the claimed entries after a successful export, or return them to the journal."""
+	cache = frappe.cache()
+	claimed = cache.make_key(CLAIMED_KEY)
+	if not done:
+		redis.Redis.sunionstore(cache, cache.make_key(JOURNAL_KEY), [claimed, cache.make_key(JOURNAL_KEY)])
+	redis.Redis.delete(cache, claimed)
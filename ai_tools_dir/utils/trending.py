@@ -0,0 +1,111 @@
+"""Materialized "trending" score from time-decayed clicks and votes.
+
+Each event of weight w at time t contributes w * exp(-(now - t) / TAU) to a tool's
+trending mass. Rather than re-decaying every row as time passes, the score is stored
+in log space against a fixed epoch:
+
+	trending_score = ln(sum(w * exp((t - EPOCH) / TAU)))
+
+Ordering by this value is the same as ordering by the decayed mass at any moment,
+so an old score never needs rewriting; adding an event is a logaddexp with
+ln(w) + (t - EPOCH) / TAU. A tool with no activity keeps the default 0.
+
+Click and vote paths only HINCRBYFLOAT a Redis hash (`record`); `drain_pending`
+runs every few minutes and updates just the tools that saw activity, treating the
+buffered weight as if it happened at drain time. Each claimed batch carries an id
+that is stored in the same transaction as the score updates, so a run that dies
+between the commit and releasing the batch does not apply it twice.
+"""
+
+import math
+import time
+
+import frappe
+import redis
+
+from ai_tools_dir.utils.page_cache import bump_tools
+
+HALF_LIFE = 3 * 24 * 3600
+TAU = HALF_LIFE / math.log(2)
+# 2025-01-01T00:00:00Z
+EPOCH = 1735689600
+CLICK_WEIGHT = 1.0
+VOTE_WEIGHT = 3.0
+BATCH_SIZE = 500
+PENDING_KEY = "ai_tools_dir:trending:pending"
+DRAINING_KEY = "ai_tools_dir:trending:draining"
+BATCH_ID_KEY = "ai_tools_dir:trending:draining_id"
+# global default holding the id of the last batch committed to tabTool
+APPLIED_BATCH = "ai_tools_trending_applied_batch"
+
+# ln(exp(a) + exp(b)), with 0 meaning "no activity yet"
+_LOGADDEXP_SQL = """CASE WHEN COALESCE(trending_score, 0) > 0
+	THEN GREATEST(trending_score, {x}) + LN(1 + EXP(-ABS(trending_score - {x})))
+	ELSE {x} END"""
+
+
+def record(tool_name: str, weight: float) -> None:
+	"""Buffer activity for a tool; applied by the next `drain_pending` run."""
+	if not tool_name or weight <= 0:
+		return
+	cache = frappe.cache()
+	try:
+		redis.Redis.hincrbyfloat(cache, cache.make_key(PENDING_KEY), tool_name, weight)
+	except redis.exceptions.RedisError:
+		frappe.logger("ai_tools_dir").exception("failed to buffer trending activity")
+
+
+def event_exponent(weight: float, at: float | None = None) -> float:
+	return math.log(weight) + ((at if at is not None else time.time()) - EPOCH) / TAU
+
+
+def _claim_pending(cache) -> tuple[str | None, dict[str, float]]:
+	"""(batch id, {tool: weight}) of the batch to apply."""
+	draining = cache.make_key(DRAINING_KEY)
+	# a previous run that died after claiming leaves its batch in DRAINING_KEY
+	if not redis.Redis.exists(cache, draining):
+		try:
+			redis.Redis.rename(cache, cache.make_key(PENDING_KEY), draining)
+		except redis.exceptions.ResponseError:
+			# no pending activity
+			return None, {}
+	redis.Redis.set(cache, cache.make_key(BATCH_ID_KEY), frappe.generate_hash(length=16), nx=True)
+	batch_id = frappe.safe_decode(redis.Redis.get(cache, cache.make_key(BATCH_ID_KEY)))
+	pending = {frappe.safe_decode(k): float(v) for k, v in redis.Redis.hgetall(cache, draining).items()}
+	return batch_id, pending
+
+
+def _release(cache) -> None:
+	redis.Redis.delete(cache, cache.make_key(DRAINING_KEY), cache.make_key(BATCH_ID_KEY))
+
+
+def drain_pending() -> dict:
+	"""Scheduled job: fold buffered activity into Tool.trending_score."""
+	cache = frappe.cache()
+	batch_id, pending = _claim_pending(cache)
+	if not pending:
+		return {"updated": 0}
+	if frappe.db.get_global(APPLIED_BATCH) == batch_id:
+		# committed by a run that died before releasing the batch
+		_release(cache)
+		return {"updated": 0}
+	now = time.time()
+	items = [(name, event_exponent(w, now)) for name, w in pending.items() if w > 0]
+	for start in range(0, len(items), BATCH_SIZE):
+		batch = items[start : start + BATCH_SIZE]
+		params = {"names": tuple(n for n, _ in batch)}
+		cases = []
+		for i, (name, x) in enumerate(batch):
+			params[f"n{i}"], params[f"x{i}"] = name, x
+			cases.append(f"WHEN %(n{i})s THEN %(x{i})s")
+		x = f"(CASE name {' '.join(cases)} END)"
+		frappe.db.sql(
+			f"UPDATE `tabTool` SET trending_score = {_LOGADDEXP_SQL.format(x=x)} WHERE name IN %(names)s",
+			params,
+		)
+	frappe.db.set_global(APPLIED_BATCH, batch_id)
+	frappe.db.commit()
+	_release(cache)
+	# tool generations too: the JSON API projects trending_score on tool detail
+	bump_tools([name for name, _ in items], journal_tools=False)
+	return {"updated": len(items)}
@@ -0,0 +1,89 @@
+"""Per-user upvote state backed by a Redis set.
+
+Each user's voted tool names live in `ai_tools_dir:votes:<user>`. The set is loaded
+from `tabTool Vote` on first use (the (user, tool) index makes that an index-only
+read) and marked with LOADED; api.vote.toggle_upvote keeps it in sync afterwards.
+Pages only ask about the tools they show, in one pipelined round trip. If Redis is
+unavailable the same question is answered from the database.
+"""
+
+import frappe
+import redis
+
+KEY = "ai_tools_dir:votes:{user}"
+# never a Tool name: marks a set that holds all of the user's votes
+LOADED = "*"
+TTL = 24 * 3600
+
+
+def _key(cache, user: str) -> str:
+	return cache.make_key(KEY.format(user=user))
+
+
+def _from_db(user: str, names: list[str]) -> set[str]:
+	return set(frappe.get_all("Tool Vote", filters={"user": user, "tool": ["in", names]}, pluck="tool"))
+
+
+def _load(cache, key: str, user: str) -> set[str]:
+	voted = set(frappe.get_all("Tool Vote", filters={"user": user}, pluck="tool"))
+	pipe = cache.pipeline(transaction=False)
+	pipe.sadd(key, LOADED, *voted)
+	pipe.expire(key, TTL)
+	pipe.execute()
+	return voted
+
+
+def voted_tools(names: list[str], user: str | None = None) -> set[str]:
+	"""The subset of tool `names` the user (default: session user) has upvoted."""
+	user = user or frappe.session.user
+	names = [n for n in dict.fromkeys(names or []) if n]
+	if not names or not user or user == "Guest":
+		return set()
+	cache = frappe.cache()
+	key = _key(cache, user)
+	try:
+		pipe = cache.pipeline(transaction=False)
+		pipe.sismember(key, LOADED)
+		for name in names:
+			pipe.sismember(key, name)
+		loaded, *flags = pipe.execute()
+		if not loaded:
+			return _load(cache, key, user).intersection(names)
+	except redis.exceptions.RedisError:
+		return _from_db(user, names)
+	return {name for name, flag in zip(names, flags, strict=True) if flag}
+
+
+def has_voted(tool_name: str, user: str | None = None) -> bool:
+	return tool_name in voted_tools([tool_name], user)
+
+
+def record_vote(user: str, tool_name: str, voted: bool) -> None:
+	"""Mirror a committed vote change into the user's set.
+
+	Applied whether or not the set is loaded; an unloaded set is still completed
+	from the database on its next read because LOADED is missing.
+	"""
+	cache = frappe.cache()
+	key = _key(cache, user)
+	try:
+		pipe = cache.pipeline(transaction=False)
+		if voted:
+			pipe.sadd(key, tool_name)
+		else:
+			pipe.srem(key, tool_name)
+		pipe.expire(key, TTL)
+		pipe.execute()
+	except redis.exceptions.RedisError:
+		# drop the set so the next read rebuilds it from the database
+		try:
+			redis.Redis.delete(cache, key)
+		except redis.exceptions.RedisError:
+			frappe.logger("ai_tools_dir").exception("failed to sync vote state")
+
+
+def clear_vote_state(doc, method=None) -> None:
+	"""Tool Vote hook: votes removed outside toggle_upvote (e.g. a deleted Tool)."""
+	if not frappe.flags.in_vote_toggle:
+		cache = frappe.cache()
+		redis.Redis.delete(cache, _key(cache, doc.user))
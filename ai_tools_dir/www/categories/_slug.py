@@ -1,19 +1,38 @@
 import frappe
 
+from ai_tools_dir.utils.counts import approved_count
+from ai_tools_dir.utils.listing import NUMBERED_PAGES, PAGE_SIZE, clamp_page, fetch_page, normalize_sort
+
 
 def get_context(context):
-    slug = frappe.form_dict.get("slug")
-    if not slug:
-        frappe.throw("Missing slug")
-    catname = frappe.db.get_value("Category", {"slug": slug}, "name")
-    if not catname:
-        frappe.throw("Not Found", frappe.DoesNotExistError)
-    context.category = frappe.get_doc("Category", catname)
-    context.tools = frappe.get_all(
-        "Tool",
-        fields=["name", "tool_name", "slug", "pricing", "logo", "average_rating"],
-        filters={"category": context.category.name, "ingestion_status": "Approved"},
-        order_by="modified desc",
-        limit=100,
-    )
+	# Guest renders are cached by utils.page_cache
+	context.no_cache = 1
+	slug = frappe.form_dict.get("slug")
+	if not slug:
+		frappe.throw("Missing slug")
+	category = frappe.db.get_value("Category", {"slug": slug}, ["name", "slug", "description"], as_dict=True)
+	if not category:
+		frappe.throw("Not Found", frappe.DoesNotExistError)
+	context.category = category
+	context.sort = normalize_sort(frappe.form_dict.get("sort"))
+	cursor = frappe.form_dict.get("cursor") or None
+	page = clamp_page(frappe.form_dict.get("page"))
+
+	# Same keyset listing and cached counts as the homepage's category filter
+	tools, next_cursor = fetch_page(
+		["category = %(category)s"],
+		{"category": category.name},
+		sort=context.sort,
+		cursor=cursor,
+		page=page,
+	)
+	total = approved_count(category=category.name)
+	total_pages = (total + PAGE_SIZE - 1) // PAGE_SIZE
 
+	context.tools = tools
+	context.total = total
+	context.page = page
+	context.total_pages = total_pages
+	context.numbered_pages = min(total_pages, NUMBERED_PAGES)
+	context.cursor = cursor
+	context.next_cursor = next_cursor if (cursor or page >= NUMBERED_PAGES) else None
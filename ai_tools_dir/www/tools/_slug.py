@@ -1,25 +1,45 @@
 import frappe
 
+from ai_tools_dir.api.reviews import first_review_page
+from ai_tools_dir.utils.votes import has_voted
+
+# Only what tools/_slug.html renders
+TOOL_FIELDS = [
+	"name",
+	"tool_name",
+	"slug",
+	"description",
+	"website",
+	"pricing",
+	"category",
+	"logo",
+	"average_rating",
+	"review_count",
+	"upvote_count",
+	"rating_1",
+	"rating_2",
+	"rating_3",
+	"rating_4",
+	"rating_5",
+]
 
-def get_context(context):
-    slug = frappe.form_dict.get("slug")
-    if not slug:
-        frappe.throw("Missing slug")
-    docname = frappe.db.get_value("Tool", {"slug": slug, "ingestion_status": "Approved"}, "name")
-    if not docname:
-        frappe.throw("Not Found", frappe.DoesNotExistError)
-    context.tool = frappe.get_doc("Tool", docname)
-    # Click tracking is now handled by the frontend trackClick function
-    # current user's vote state
-    user = frappe.session.user
-    has_voted = False
-    if user and user != "Guest":
-        has_voted = bool(frappe.db.exists("Tool Vote", {"tool": docname, "user": user}))
-    context.has_voted = has_voted
-    context.reviews = frappe.get_all(
-        "Review",
-        fields=["name", "user", "rating", "comment"],
-        filters={"tool": context.tool.name},
-        order_by="modified desc",
-    )
 
+def get_context(context):
+	# Guest renders are cached by utils.page_cache
+	context.no_cache = 1
+	slug = frappe.form_dict.get("slug")
+	if not slug:
+		frappe.throw("Missing slug")
+	tool = frappe.db.get_value(
+		"Tool", {"slug": slug, "ingestion_status": "Approved"}, TOOL_FIELDS, as_dict=True
+	)
+	if not tool:
+		frappe.throw("Not Found", frappe.DoesNotExistError)
+	context.tool = tool
+	# Click tracking is now handled by the frontend trackClick function
+	# current user's vote state (False for guests)
+	context.has_voted = has_voted(tool.name)
+	# First page is rendered here; later pages come from api.reviews.get_reviews
+	page = first_review_page(tool.name)
+	context.reviews = page["reviews"]
+	context.reviews_next_cursor = page["next_cursor"]